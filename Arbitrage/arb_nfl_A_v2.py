@@ -17,6 +17,7 @@ The process:
 
 #Imports
 import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 
 from pinnacle_nfl_odds_A import fetch_pinnacle_nfl_df
@@ -89,8 +90,12 @@ def kelly_fraction(pinnacle_odds, kalshi_odds, shrinkage=0.2):
 def simulate_trade():
     t0 = time.time()
 
-    kalshi_df = fetch_kalshi_nfl_df() # Kalshi - all currently open NFL game markets with current bid/ask prices for both yes & no sides
-    pinnacle_df = fetch_pinnacle_nfl_df() # Pinnacle: upcoming NFL games that currently have open betting markets (not live)
+    # Both fetches are independent network calls, so run them side by side
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        kalshi_future = pool.submit(fetch_kalshi_nfl_df) # Kalshi - all currently open NFL game markets with current bid/ask prices for both yes & no sides
+        pinnacle_future = pool.submit(fetch_pinnacle_nfl_df) # Pinnacle: upcoming NFL games that currently have open betting markets (not live)
+        kalshi_df = kalshi_future.result()
+        pinnacle_df = pinnacle_future.result()
 
     if kalshi_df.empty or pinnacle_df.empty:
         print("No data found.")
@@ -15,7 +15,8 @@ def insert_df(df: pd.DataFrame, table: str):
     if df.empty:
         print(f"No rows to insert for {table}")
         return
-    records = df.to_dict(orient="records")
+    # NaN / pd.NA (from the pinned nullable and float dtypes) are not JSON; send them as null
+    records = df.astype(object).where(df.notna(), None).to_dict(orient="records")
     batch_size = 500
     for i in range(0, len(records), batch_size):
         chunk = records[i:i+batch_size]
@@ -34,11 +34,22 @@ except Exception:
 	pass
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+	# Optional: orjson decodes large archive/details payloads several times faster than stdlib json
+	import orjson as _orjson  # type: ignore
+except Exception:
+	_orjson = None
 
 
 RAPIDAPI_HOST = "pinnacle-odds.p.rapidapi.com"
 BASE_URL = f"https://{RAPIDAPI_HOST}"
 
+# Connection pool size per host; covers the concurrent archive page prefetch in terminal_ui
+HTTP_POOL_SIZE = 32
+
 
 def parse_params_json(params_json: Optional[str]) -> Optional[Dict[str, Any]]:
 	if not params_json:
@@ -81,17 +92,32 @@ class PinnacleOddsClient:
 			"X-RapidAPI-Key": api_key,
 			"X-RapidAPI-Host": RAPIDAPI_HOST,
 		}
+		# One pooled session per client so repeated calls (archive paging, details) reuse connections
+		self.session = requests.Session()
+		self.session.headers.update(self.headers)
+		# Retry transient failures (rate limit, 5xx) with backoff; after the last attempt the
+		# response is returned as-is so raise_for_status still raises HTTPError for callers
+		retry = Retry(
+			total=3,
+			backoff_factor=0.3,
+			status_forcelist=(429, 500, 502, 503, 504),
+			raise_on_status=False,
+		)
+		adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+		self.session.mount("https://", adapter)
 
 	def _request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None, json_body: Optional[Dict[str, Any]] = None) -> Any:
 		url = BASE_URL + ensure_leading_slash(path)
 		if method.upper() == "GET":
-			resp = requests.get(url, headers=self.headers, params=params, timeout=self.timeout_seconds)
+			resp = self.session.get(url, params=params, timeout=self.timeout_seconds)
 		elif method.upper() == "POST":
-			resp = requests.post(url, headers=self.headers, json=json_body or {}, timeout=self.timeout_seconds)
+			resp = self.session.post(url, json=json_body or {}, timeout=self.timeout_seconds)
 		else:
 			raise ValueError(f"Unsupported method: {method}.")
 		resp.raise_for_status()
 		try:
+			if _orjson is not None:
+				return _orjson.loads(resp.content)
 			return resp.json()
 		except ValueError:
 			return resp.text
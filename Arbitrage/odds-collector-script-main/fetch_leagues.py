@@ -1,7 +1,11 @@
 import csv
+import json
 import os
+import sqlite3
 import sys
-from typing import Any, Dict, Iterable, List, Tuple
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 try:
     from dotenv import load_dotenv  # type: ignore
@@ -86,120 +90,124 @@ def dedupe_in_place(csv_path: str) -> int:
     return len(rows_out)
 
 
+# Cached details are reused for this long; a payload fetched once its event had started over
+# DETAILS_CACHE_SETTLED_SECONDS earlier holds the final history and is kept indefinitely
+DETAILS_CACHE_TTL_SECONDS = 3600
+DETAILS_CACHE_SETTLED_SECONDS = 7 * 24 * 3600
+
+
+def _open_details_cache(path: str) -> sqlite3.Connection:
+    # Persistent event_id -> event_details payload store so re-runs skip the network
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS event_details (event_id INTEGER PRIMARY KEY, payload TEXT NOT NULL, fetched_at REAL)"
+    )
+    # Caches created before fetched_at existed: their rows read as stale and get re-fetched
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(event_details)")}
+    if "fetched_at" not in columns:
+        conn.execute("ALTER TABLE event_details ADD COLUMN fetched_at REAL")
+    conn.commit()
+    return conn
+
+
+def _details_cache_fresh(fetched_at: Optional[float], starts_epoch: Optional[float]) -> bool:
+    if fetched_at is None:
+        return False
+    if time.time() - fetched_at <= DETAILS_CACHE_TTL_SECONDS:
+        return True
+    # Upcoming or in-progress events keep gaining ticks; only settled payloads are final
+    return starts_epoch is not None and fetched_at - starts_epoch >= DETAILS_CACHE_SETTLED_SECONDS
+
+
+def _fetch_event_details(
+    client: PinnacleOddsClient,
+    event_id: int,
+    cache: Optional[sqlite3.Connection],
+    starts_epoch: Optional[float] = None,
+) -> Any:
+    if cache is not None:
+        hit = cache.execute("SELECT payload, fetched_at FROM event_details WHERE event_id = ?", (event_id,)).fetchone()
+        if hit is not None and _details_cache_fresh(hit[1], starts_epoch):
+            return json.loads(hit[0])
+    details = client.event_details(event_id=event_id)
+    if cache is not None:
+        cache.execute(
+            "INSERT OR REPLACE INTO event_details (event_id, payload, fetched_at) VALUES (?, ?, ?)",
+            (event_id, json.dumps(details), time.time()),
+        )
+        cache.commit()
+    return details
+
+
 def _name_compact(name: str) -> str:
     return "".join(ch for ch in str(name) if ch.isalnum()) or "unknown"
 
 
-def _export_event_csv_from_details(details: Dict[str, Any], out_dir: str) -> str:
-    from datetime import datetime, timezone as _tz
-
-    def _to_epoch_and_iso(ts_val: Any) -> Tuple[int, str]:
-        ts = int(ts_val)
-        if ts > 10**12:
-            ts = int(ts // 1000)
-        iso = datetime.fromtimestamp(ts, tz=_tz.utc).isoformat()
-        return ts, iso
-
-    def _iter_event_period_ticks(event: Dict[str, Any], period: Dict[str, Any]):
-        sport_id = event.get("sport_id")
-        league_id = event.get("league_id")
-        league_name = event.get("league_name")
-        home = event.get("home")
-        away = event.get("away")
-        starts = event.get("starts")
-        event_id_local = event.get("event_id") or event.get("eventId")
-
-        period_number = period.get("number")
-        period_description = period.get("description")
-        hist = (period.get("history") or {})
-
-        ml = hist.get("moneyline") or {}
-        for side in ("home", "away", "draw"):
-            for row in (ml.get(side) or []):
-                if not isinstance(row, (list, tuple)) or len(row) < 2:
-                    continue
-                ts, price = row[0], row[1]
-                limit = row[2] if len(row) > 2 else None
-                ts_epoch, ts_iso = _to_epoch_and_iso(ts)
-                yield {
-                    "event_id": event_id_local,
-                    "sport_id": sport_id,
-                    "league_id": league_id,
-                    "league_name": league_name,
-                    "home": home,
-                    "away": away,
-                    "starts": starts,
-                    "period_number": period_number,
-                    "period_description": period_description,
-                    "market": "moneyline",
-                    "line": None,
-                    "side": side,
-                    "ts_iso": ts_iso,
-                    "ts_epoch": ts_epoch,
-                    "price": price,
-                    "limit": limit,
-                }
+def _to_epoch_and_iso(ts_val: Any) -> Tuple[int, str]:
+    ts = int(ts_val)
+    if ts > 10**12:
+        ts = int(ts // 1000)
+    iso = datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+    return ts, iso
 
-        spreads = hist.get("spreads") or {}
-        for line, sides in spreads.items():
-            if not isinstance(sides, dict):
-                continue
-            for side in ("home", "away"):
-                for row in (sides.get(side) or []):
-                    if not isinstance(row, (list, tuple)) or len(row) < 2:
-                        continue
-                    ts, price = row[0], row[1]
-                    limit = row[2] if len(row) > 2 else None
-                    ts_epoch, ts_iso = _to_epoch_and_iso(ts)
-                    yield {
-                        "event_id": event_id_local,
-                        "sport_id": sport_id,
-                        "league_id": league_id,
-                        "league_name": league_name,
-                        "home": home,
-                        "away": away,
-                        "starts": starts,
-                        "period_number": period_number,
-                        "period_description": period_description,
-                        "market": "spread",
-                        "line": line,
-                        "side": side,
-                        "ts_iso": ts_iso,
-                        "ts_epoch": ts_epoch,
-                        "price": price,
-                        "limit": limit,
-                    }
-
-        totals = hist.get("totals") or {}
-        for line, sides in totals.items():
-            if not isinstance(sides, dict):
-                continue
-            for side in ("over", "under"):
-                for row in (sides.get(side) or []):
-                    if not isinstance(row, (list, tuple)) or len(row) < 2:
-                        continue
-                    ts, price = row[0], row[1]
-                    limit = row[2] if len(row) > 2 else None
-                    ts_epoch, ts_iso = _to_epoch_and_iso(ts)
-                    yield {
-                        "event_id": event_id_local,
-                        "sport_id": sport_id,
-                        "league_id": league_id,
-                        "league_name": league_name,
-                        "home": home,
-                        "away": away,
-                        "starts": starts,
-                        "period_number": period_number,
-                        "period_description": period_description,
-                        "market": "total",
-                        "line": line,
-                        "side": side,
-                        "ts_iso": ts_iso,
-                        "ts_epoch": ts_epoch,
-                        "price": price,
-                        "limit": limit,
-                    }
 
+def _append_seq_ticks(out: List[Dict[str, Any]], base: Dict[str, Any], seq: Any) -> None:
+    append = out.append
+    for row in (seq or ()):
+        if not isinstance(row, (list, tuple)) or len(row) < 2:
+            continue
+        ts_epoch, ts_iso = _to_epoch_and_iso(row[0])
+        r = base.copy()
+        r["ts_iso"] = ts_iso
+        r["ts_epoch"] = ts_epoch
+        r["price"] = row[1]
+        r["limit"] = row[2] if len(row) > 2 else None
+        append(r)
+
+
+def _append_period_ticks(out: List[Dict[str, Any]], event: Dict[str, Any], period: Dict[str, Any]) -> None:
+    # Event/period metadata is resolved once into a template; each tick copies it
+    # (one C-level dict copy) and fills only the four per-tick fields.
+    period_base = {
+        "event_id": event.get("event_id") or event.get("eventId"),
+        "sport_id": event.get("sport_id"),
+        "league_id": event.get("league_id"),
+        "league_name": event.get("league_name"),
+        "home": event.get("home"),
+        "away": event.get("away"),
+        "starts": event.get("starts"),
+        "period_number": period.get("number"),
+        "period_description": period.get("description"),
+    }
+    hist = (period.get("history") or {})
+
+    ml = hist.get("moneyline") or {}
+    for side in ("home", "away", "draw"):
+        base = dict(period_base, market="moneyline", line=None, side=side)
+        _append_seq_ticks(out, base, ml.get(side))
+
+    spreads = hist.get("spreads") or {}
+    for line, sides in spreads.items():
+        if not isinstance(sides, dict):
+            continue
+        for side in ("home", "away"):
+            base = dict(period_base, market="spread", line=line, side=side)
+            _append_seq_ticks(out, base, sides.get(side))
+
+    totals = hist.get("totals") or {}
+    for line, sides in totals.items():
+        if not isinstance(sides, dict):
+            continue
+        for side in ("over", "under"):
+            base = dict(period_base, market="total", line=line, side=side)
+            _append_seq_ticks(out, base, sides.get(side))
+
+
+def _export_event_csv_from_details(details: Dict[str, Any], out_dir: str) -> str:
     def _parse_iso_utc(ts: str):
         s = (ts or "").strip()
         if not s:
@@ -228,10 +236,10 @@ def _export_event_csv_from_details(details: Dict[str, Any], out_dir: str) -> str
     else:
         event = details if isinstance(details, dict) else {}
 
-    rows = []
+    rows: List[Dict[str, Any]] = []
     for period in (event.get("periods") or {}).values():
         if isinstance(period, dict):
-            rows.extend(list(_iter_event_period_ticks(event, period)))
+            _append_period_ticks(rows, event, period)
     rows.sort(key=lambda r: (
         r.get("event_id"),
         r.get("period_number"),
@@ -247,7 +255,6 @@ def _export_event_csv_from_details(details: Dict[str, Any], out_dir: str) -> str
     dt = _parse_iso_utc(str(starts))
     date_str = dt.date().isoformat() if dt else str(starts)[:10]
     fname = f"{date_str}_{_name_compact(home)}_{_name_compact(away)}.csv"
-    os.makedirs(out_dir, exist_ok=True)
     out_path = os.path.join(out_dir, fname)
 
     with open(out_path, "w", newline="", encoding="utf-8") as f:
@@ -274,6 +281,8 @@ def main(argv: list[str]) -> int:
     parser.add_argument("--skip-existing", dest="skip_existing", action="store_true", help="Skip API call if expected output file already exists")
     parser.add_argument("--skip-downloaded", dest="skip_downloaded", action="store_true", help="Skip rows already marked downloaded in input CSV")
     parser.add_argument("--mark-downloaded", dest="mark_downloaded", action="store_true", help="After run, mark downloaded=yes for rows exported or already present")
+    parser.add_argument("--cache-db", dest="cache_db", default="cache.sqlite", help="SQLite file caching event details between runs")
+    parser.add_argument("--no-cache", dest="no_cache", action="store_true", help="Always fetch event details from the API")
     args = parser.parse_args(argv[1:])
 
     csv_path = args.csv_path
@@ -286,6 +295,8 @@ def main(argv: list[str]) -> int:
             except EOFError:
                 pass
         return 2
+    # Created once here; per-row path helpers and the exporter assume it exists
+    os.makedirs(out_dir, exist_ok=True)
 
     # Dedupe in place (preserves optional 'downloaded' column)
     n_unique = dedupe_in_place(csv_path)
@@ -318,7 +329,6 @@ def main(argv: list[str]) -> int:
         dt = _parse_iso_utc_for_row(row.get("starts", ""))
         date_str = dt.date().isoformat() if dt else (row.get("starts", "")[:10])
         fname = f"{date_str}_{_name_compact(row.get('home', 'home'))}_{_name_compact(row.get('away', 'away'))}.csv"
-        os.makedirs(base_dir, exist_ok=True)
         return os.path.join(base_dir, fname)
 
     # Read rows to fetch with optional skipping
@@ -369,6 +379,7 @@ def main(argv: list[str]) -> int:
                 pass
         return 3
     client = PinnacleOddsClient(api_key=api_key)
+    cache = None if args.no_cache else _open_details_cache(args.cache_db)
 
     exported = 0
     processed_success_event_ids: set[int] = set()
@@ -382,13 +393,19 @@ def main(argv: list[str]) -> int:
             print(f"Skipping row with invalid event_id: {eid_raw}")
             continue
         try:
-            details = client.event_details(event_id=eid)
+            starts_dt = _parse_iso_utc_for_row(r.get("starts", ""))
+            if starts_dt is not None and starts_dt.tzinfo is None:
+                starts_dt = starts_dt.replace(tzinfo=timezone.utc)
+            starts_epoch = starts_dt.timestamp() if starts_dt is not None else None
+            details = _fetch_event_details(client, eid, cache, starts_epoch)
             out_path = _export_event_csv_from_details(details, out_dir=out_dir)
             exported += 1
             print(f"[{exported}] Wrote {out_path}")
             processed_success_event_ids.add(eid)
         except Exception as exc:
             print(f"Failed to fetch/export event {eid}: {exc}")
+    if cache is not None:
+        cache.close()
 
     # Optionally mark downloaded column in the CSV
     if args.mark_downloaded:
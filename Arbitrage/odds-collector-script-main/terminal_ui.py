@@ -16,39 +16,90 @@ Usage:
 """
 
 import csv
+import gzip
+import hashlib
 import json
 import argparse
-import requests
 import os
+import re
 import sys
+import tempfile
+import threading
+import time
 
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# requests, python-dotenv and the API client are imported where they are used so that
+# --help and other short runs do not pay their import cost
+if TYPE_CHECKING:
+    from api import PinnacleOddsClient
 
 try:
-    from dotenv import load_dotenv  # type: ignore
-    load_dotenv()
+    # Optional: orjson is several times faster for the page cache and the JSON columns
+    import orjson as _orjson  # type: ignore
 except Exception:
-    pass
-
-from api import PinnacleOddsClient
+    _orjson = None
 
 
 def _should_pause() -> bool:
     return str(os.getenv("NO_PAUSE", "")).strip().lower() not in ("1", "true", "t", "yes", "y")
 
 
+def _json_dumps(obj: Any) -> str:
+    # Compact UTF-8 JSON text; the stdlib fallback is formatted the same way as orjson
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _json_loads(text: str) -> Any:
+    if _orjson is not None:
+        return _orjson.loads(text)
+    return json.loads(text)
+
+
 def _normalize(text: str) -> str:
     return str(text).strip().lower()
 
 
-def _get_first(d: Dict[str, Any], keys: List[str], default: Any = None) -> Any:
+# Provider field aliases, in lookup order
+_EID_KEYS = ("event_id", "eventId")
+_LID_KEYS = ("league_id", "leagueId")
+_STARTS_KEYS = ("starts", "start_time", "startTime")
+
+
+def _get_first(d: Dict[str, Any], keys: Iterable[str], default: Any = None) -> Any:
     for k in keys:
         if k in d and d[k] is not None:
             return d[k]
     return default
 
 
+# Hot-loop lookups for the common fields: plain .get chains, no per-call key tuple walk
+def _ev_starts(ev: Dict[str, Any]) -> Any:
+    starts = ev.get("starts")
+    if starts is None:
+        starts = ev.get("start_time")
+        if starts is None:
+            starts = ev.get("startTime")
+    return starts
+
+
+def _ev_league_id(ev: Dict[str, Any]) -> Any:
+    lid = ev.get("league_id")
+    return ev.get("leagueId") if lid is None else lid
+
+
+def _ev_event_id(ev: Dict[str, Any]) -> Any:
+    eid = ev.get("event_id")
+    return ev.get("eventId") if eid is None else eid
+
+
 def _header(title: str, emoji: str) -> None:
     print(f"\n{emoji}  {title}\n")
 
@@ -64,163 +115,167 @@ def _extract_items(resp: Any, keys: List[str]) -> List[Dict[str, Any]]:
     return []
 
 
+# Characters that are unsafe in file names (plus spaces) map to "_"
+_FILENAME_UNSAFE = str.maketrans({ch: "_" for ch in '/\\:*?"<>| '})
+
+
+@lru_cache(maxsize=1024)
 def _sanitize_name(name: str) -> str:
-    s = str(name).strip()
-    for ch in ("/", "\\", ":", "*", "?", '"', "<", ">", "|"):
-        s = s.replace(ch, "_")
-    s = s.replace(" ", "_")
+    s = str(name).strip().translate(_FILENAME_UNSAFE)
     return s or "unknown"
 
 
+@lru_cache(maxsize=1024)
 def _name_compact(name: str) -> str:
     # Remove all non-alphanumeric characters and spaces; keep letters/numbers only
     return "".join(ch for ch in str(name) if ch.isalnum()) or "unknown"
 
 
-def _export_event_csv_from_details(details: Dict[str, Any]) -> str:
-    # Build rows from periods.history across all markets
-    def _to_epoch_and_iso(ts_val: Any) -> Tuple[int, str]:
-        ts = int(ts_val)
-        if ts > 10**12:
-            ts = int(ts // 1000)
-        from datetime import datetime, timezone as _tz
-        iso = datetime.fromtimestamp(ts, tz=_tz.utc).isoformat()
-        return ts, iso
-
-    def _iter_event_period_ticks(event: Dict[str, Any], period_key: str, period: Dict[str, Any]):
-        sport_id = event.get("sport_id")
-        league_id = event.get("league_id")
-        league_name = event.get("league_name")
-        home = event.get("home")
-        away = event.get("away")
-        starts = event.get("starts")
-        event_id_local = event.get("event_id") or event.get("eventId")
-
-        period_number = period.get("number")
-        period_description = period.get("description")
-        hist = (period.get("history") or {})
-
-        # moneyline
-        ml = hist.get("moneyline") or {}
-        for side in ("home", "away", "draw"):
-            seq = ml.get(side) or []
-            for row in seq:
-                if not isinstance(row, (list, tuple)) or len(row) < 2:
-                    continue
-                ts, price = row[0], row[1]
-                limit = row[2] if len(row) > 2 else None
-                ts_epoch, ts_iso = _to_epoch_and_iso(ts)
-                yield {
-                    "event_id": event_id_local,
-                    "sport_id": sport_id,
-                    "league_id": league_id,
-                    "league_name": league_name,
-                    "home": home,
-                    "away": away,
-                    "starts": starts,
-                    "period_number": period_number,
-                    "period_description": period_description,
-                    "market": "moneyline",
-                    "line": None,
-                    "side": side,
-                    "ts_iso": ts_iso,
-                    "ts_epoch": ts_epoch,
-                    "price": price,
-                    "limit": limit,
-                }
-
-        # spreads
-        spreads = hist.get("spreads") or {}
-        for line, sides in spreads.items():
+# Column order of the cleaned tick CSV
+TICK_FIELDNAMES = [
+    "event_id", "sport_id", "league_id", "league_name", "home", "away", "starts",
+    "period_number", "period_description",
+    "market", "line", "side", "ts_iso", "ts_epoch", "price", "limit",
+]
+
+
+# Write buffer for CSV outputs (the 8 KiB default means many small writes on big exports)
+_CSV_BUFFER_SIZE = 1 << 20
+
+
+# Same text as datetime.fromtimestamp(ts, tz=timezone.utc).isoformat() for whole seconds
+_ISO_UTC_FORMAT = "%Y-%m-%dT%H:%M:%S+00:00"
+
+
+def _epochs_and_isos(raw_ts: List[Any]) -> Tuple[List[int], List[str]]:
+    # Whole-column conversion: millisecond stamps are folded to seconds, then formatted in one pass
+    epochs = [ts // 1000 if ts > 10**12 else ts for ts in map(int, raw_ts)]
+    gmtime = time.gmtime
+    strftime = time.strftime
+    # Sides and lines of a market tick at the same instants, so each distinct second is formatted once
+    iso_by_epoch = {ts: strftime(_ISO_UTC_FORMAT, gmtime(ts)) for ts in set(epochs)}
+    return epochs, list(map(iso_by_epoch.__getitem__, epochs))
+
+
+# Row container types accepted for the zip fast path in _collect_period_ticks
+_TICK_ROW_TYPES = frozenset((list, tuple))
+
+
+# (history key, market name, sides in output order, keyed by line)
+_MARKET_SPECS: Tuple[Tuple[str, str, Tuple[str, ...], bool], ...] = (
+    ("moneyline", "moneyline", ("home", "away", "draw"), False),
+    ("spreads", "spread", ("home", "away"), True),
+    ("totals", "total", ("over", "under"), True),
+)
+
+
+def _collect_period_ticks(cols: Dict[str, List[Any]], event: Dict[str, Any], period: Dict[str, Any]) -> None:
+    # Appends one value per tick to each column list in `cols` (keyed by TICK_FIELDNAMES).
+    # ts_epoch receives the raw provider timestamp and ts_iso is left for _collect_detail_ticks.
+    # The nine event/period columns are constant for a sequence, so they are extended in bulk.
+    constants = (
+        event.get("event_id") or event.get("eventId"),
+        event.get("sport_id"),
+        event.get("league_id"),
+        event.get("league_name"),
+        event.get("home"),
+        event.get("away"),
+        event.get("starts"),
+        period.get("number"),
+        period.get("description"),
+    )
+    const_cols = [cols[name] for name in TICK_FIELDNAMES[:len(constants)]]
+    market_col, line_col, side_col = cols["market"], cols["line"], cols["side"]
+    ts_col, price_col, limit_col = cols["ts_epoch"], cols["price"], cols["limit"]
+    hist = (period.get("history") or {})
+
+    def _emit(market: str, line: Any, side: str, seq: Any) -> None:
+        if not seq:
+            return
+        # Provider sequences are normally uniform [ts, price, limit] (or [ts, price]) lists;
+        # those are transposed with zip in one C-level pass. Anything else is filtered per row.
+        shape = set(map(len, seq)) if type(seq) is list and set(map(type, seq)) <= _TICK_ROW_TYPES else None
+        if shape == {3}:
+            ts_vals, prices, limits = zip(*seq)
+        elif shape == {2}:
+            ts_vals, prices = zip(*seq)
+            limits = [None] * len(seq)
+        else:
+            rows = [row for row in seq if isinstance(row, (list, tuple)) and len(row) >= 2]
+            if not rows:
+                return
+            ts_vals = [row[0] for row in rows]
+            prices = [row[1] for row in rows]
+            limits = [row[2] if len(row) > 2 else None for row in rows]
+        n = len(ts_vals)
+        for col, value in zip(const_cols, constants):
+            col.extend([value] * n)
+        market_col.extend([market] * n)
+        line_col.extend([line] * n)
+        side_col.extend([side] * n)
+        ts_col.extend(ts_vals)
+        price_col.extend(prices)
+        limit_col.extend(limits)
+
+    for hist_key, market, sides_order, with_line in _MARKET_SPECS:
+        section = hist.get(hist_key) or {}
+        if not with_line:
+            for side in sides_order:
+                _emit(market, None, side, section.get(side))
+            continue
+        for line, sides in section.items():
             if not isinstance(sides, dict):
                 continue
-            for side in ("home", "away"):
-                seq = sides.get(side) or []
-                for row in seq:
-                    if not isinstance(row, (list, tuple)) or len(row) < 2:
-                        continue
-                    ts, price = row[0], row[1]
-                    limit = row[2] if len(row) > 2 else None
-                    ts_epoch, ts_iso = _to_epoch_and_iso(ts)
-                    yield {
-                        "event_id": event_id_local,
-                        "sport_id": sport_id,
-                        "league_id": league_id,
-                        "league_name": league_name,
-                        "home": home,
-                        "away": away,
-                        "starts": starts,
-                        "period_number": period_number,
-                        "period_description": period_description,
-                        "market": "spread",
-                        "line": line,
-                        "side": side,
-                        "ts_iso": ts_iso,
-                        "ts_epoch": ts_epoch,
-                        "price": price,
-                        "limit": limit,
-                    }
-
-        # totals
-        totals = hist.get("totals") or {}
-        for line, sides in totals.items():
-            if not isinstance(sides, dict):
+            for side in sides_order:
+                _emit(market, line, side, sides.get(side))
+
+
+def _collect_detail_ticks(doc: Any) -> Dict[str, List[Any]]:
+    # Column-oriented (one list per field) to avoid a dict per tick
+    cols: Dict[str, List[Any]] = {name: [] for name in TICK_FIELDNAMES}
+    events = doc.get("events") if isinstance(doc, dict) else None
+    if isinstance(events, list) and events:
+        event_list = events
+    elif isinstance(doc, dict) and any(k in doc for k in ("event_id", "eventId", "periods")):
+        event_list = [doc]
+    else:
+        event_list = []
+    for event in event_list:
+        periods = event.get("periods") or {}
+        for period in periods.values():
+            if not isinstance(period, dict):
                 continue
-            for side in ("over", "under"):
-                seq = sides.get(side) or []
-                for row in seq:
-                    if not isinstance(row, (list, tuple)) or len(row) < 2:
-                        continue
-                    ts, price = row[0], row[1]
-                    limit = row[2] if len(row) > 2 else None
-                    ts_epoch, ts_iso = _to_epoch_and_iso(ts)
-                    yield {
-                        "event_id": event_id_local,
-                        "sport_id": sport_id,
-                        "league_id": league_id,
-                        "league_name": league_name,
-                        "home": home,
-                        "away": away,
-                        "starts": starts,
-                        "period_number": period_number,
-                        "period_description": period_description,
-                        "market": "total",
-                        "line": line,
-                        "side": side,
-                        "ts_iso": ts_iso,
-                        "ts_epoch": ts_epoch,
-                        "price": price,
-                        "limit": limit,
-                    }
-
-    def _iter_all_ticks(doc: Dict[str, Any]):
-        events = doc.get("events") if isinstance(doc, dict) else None
-        if isinstance(events, list) and events:
-            for event in events:
-                periods = event.get("periods") or {}
-                for pkey, period in periods.items():
-                    if not isinstance(period, dict):
-                        continue
-                    for row in _iter_event_period_ticks(event, pkey, period):
-                        yield row
-        elif isinstance(doc, dict) and any(k in doc for k in ("event_id", "eventId", "periods")):
-            event = doc
-            periods = event.get("periods") or {}
-            for pkey, period in periods.items():
-                if not isinstance(period, dict):
-                    continue
-                for row in _iter_event_period_ticks(event, pkey, period):
-                    yield row
-
-    rows = list(_iter_all_ticks(details))
-    rows.sort(key=lambda r: (
-        r.get("event_id"),
-        r.get("period_number"),
-        r.get("ts_epoch"),
-        str(r.get("market")),
-        str(r.get("line")),
-        str(r.get("side")),
-    ))
+            _collect_period_ticks(cols, event, period)
+    cols["ts_epoch"], cols["ts_iso"] = _epochs_and_isos(cols["ts_epoch"])
+    return cols
+
+
+def _line_sort_key(line: Any) -> Tuple[int, Any]:
+    # Numeric lines first, in numeric order; anything else (None for moneyline) by its text
+    if line is not None:
+        try:
+            value = float(line)
+        except (TypeError, ValueError):
+            pass
+        else:
+            if value == value:
+                return (0, value)
+    return (1, str(line))
+
+
+def _export_event_csv_from_details(details: Dict[str, Any]) -> str:
+    # Build columns from periods.history across all markets
+    cols = _collect_detail_ticks(details)
+    eids, pnums, epochs = cols["event_id"], cols["period_number"], cols["ts_epoch"]
+    markets, sides = cols["market"], cols["side"]
+    # market/side are always strings; lines (JSON keys, so usually numeric strings) get a
+    # comparable key once per distinct value so spreads/totals sort numerically
+    line_key_map = {line: _line_sort_key(line) for line in set(cols["line"])}
+    line_keys = list(map(line_key_map.__getitem__, cols["line"]))
+    # One key tuple per tick built by zip in C; sorting indices on keys.__getitem__ avoids a
+    # Python-level key function per row
+    keys = list(zip(eids, pnums, epochs, markets, line_keys, sides))
+    order = sorted(range(len(keys)), key=keys.__getitem__)
 
     # Derive filename: YYYY-MM-DD_Team1_Team2.csv
     single_event = None
@@ -236,18 +291,11 @@ def _export_event_csv_from_details(details: Dict[str, Any]) -> str:
     date_str = dt.date().isoformat() if dt else str(starts)[:10]
     fname = f"{date_str}_{_name_compact(home)}_{_name_compact(away)}.csv"
 
-    with open(fname, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=[
-                "event_id", "sport_id", "league_id", "league_name", "home", "away", "starts",
-                "period_number", "period_description",
-                "market", "line", "side", "ts_iso", "ts_epoch", "price", "limit",
-            ],
-        )
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+    with open(fname, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(TICK_FIELDNAMES)
+        # Rows are streamed straight from the columns in sorted order; no row list is built
+        writer.writerows(zip(*(map(cols[name].__getitem__, order) for name in TICK_FIELDNAMES)))
     return fname
 
 
@@ -257,13 +305,24 @@ def _ensure_output_dir(sport_name: str, league_name: str) -> str:
     return base
 
 
+def _as_int(value: Any) -> Optional[int]:
+    # Ids usually arrive as ints or digit strings; skip the general coercion for those
+    if type(value) is int:
+        return value
+    if isinstance(value, str) and value.isdecimal():
+        return int(value)
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
 def _sport_id_from(item: Dict[str, Any]) -> Optional[int]:
     for k in ("id", "sport_id"):
         if k in item:
-            try:
-                return int(item[k])
-            except Exception:
-                continue
+            sid = _as_int(item[k])
+            if sid is not None:
+                return sid
     return None
 
 
@@ -277,10 +336,9 @@ def _sport_name_from(item: Dict[str, Any]) -> str:
 def _league_id_from(item: Dict[str, Any]) -> Optional[int]:
     for k in ("league_id", "id"):
         if k in item:
-            try:
-                return int(item[k])
-            except Exception:
-                continue
+            lid = _as_int(item[k])
+            if lid is not None:
+                return lid
     return None
 
 
@@ -291,10 +349,29 @@ def _league_name_from(item: Dict[str, Any]) -> str:
     return ""
 
 
+# YYYY-MM-DDTHH:MM:SS[.fraction][Z|+HH:MM|-HH:MM]; fractional seconds are dropped
+_ISO_RE = re.compile(r"([0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2})(?:\.[0-9]+)?(Z|[+-][0-9]{2}:[0-9]{2})?")
+
+
+# Memoized: archive scans see the same kickoff stamps many times over (datetimes are immutable)
+@lru_cache(maxsize=65536)
 def _parse_iso_utc(ts: str) -> Optional[datetime]:
     if not ts:
         return None
+    # Fast path for the provider's usual fixed layout YYYY-MM-DDTHH:MM:SSZ (same result as below)
+    if len(ts) == 20 and ts[19] == "Z" and ts[10] == "T":
+        try:
+            return datetime.fromisoformat(ts[:19] + "+00:00")
+        except ValueError:
+            pass
     s = ts.strip()
+    m = _ISO_RE.fullmatch(s)
+    if m is not None:
+        tz = m.group(2)
+        try:
+            return datetime.fromisoformat(m.group(1) + ("+00:00" if tz == "Z" else (tz or "")))
+        except ValueError:
+            pass
     try:
         # Normalize Zulu to offset
         if s.endswith("Z"):
@@ -324,6 +401,12 @@ def _parse_iso_utc(ts: str) -> Optional[datetime]:
     return None
 
 
+def _parse_iso_utc_batch(values: List[str]) -> List[Optional[datetime]]:
+    # Events on a page share kickoff times, so each distinct string is parsed once
+    parsed = {v: _parse_iso_utc(v) for v in set(values)}
+    return [parsed[v] for v in values]
+
+
 def _is_test_event(ev: Dict[str, Any]) -> bool:
     home = _normalize(str(ev.get("home") or ""))
     away = _normalize(str(ev.get("away") or ""))
@@ -347,7 +430,7 @@ def choose_from_list(title: str, rows: List[Tuple[str, Any]], emoji: str = "👉
         print("❌ Invalid selection. Try again.")
 
 
-def step_choose_sport(client: PinnacleOddsClient) -> Tuple[int, str]:
+def step_choose_sport(client: "PinnacleOddsClient") -> Tuple[int, str]:
     resp = client.list_sports()
     items = _extract_items(resp, keys=["sports", "data", "result", "response"])
     if not items:
@@ -365,51 +448,54 @@ def step_choose_sport(client: PinnacleOddsClient) -> Tuple[int, str]:
     return int(chosen_id), id_to_name.get(int(chosen_id), "")
 
 
+# Default league-name tokens per sport; a league is kept if its name contains any token
+_DEFAULT_LEAGUE_TOKENS: List[Tuple[Tuple[str, ...], Tuple[str, ...]]] = [
+    # Default filters for US major leagues
+    (("basketball",), ("nba", "ncaa")),
+    (("baseball",), ("mlb", "ncaa")),
+    # Focus on ATP/WTA and Grand Slams
+    (("tennis",), (
+        "atp",
+        "wta",
+        "australian open",
+        "french open",
+        "roland garros",
+        "wimbledon",
+        "us open",
+    )),
+    # Focus on the biggest titles/leagues
+    (("esport", "e-sport", "e sport"), (
+        # League of Legends
+        "league of legends", "lol", "lck", "lec", "lpl", "lcs",
+        # CS/Counter-Strike
+        "cs2", "csgo", "counter-strike", "esl", "blast",
+        # Dota 2
+        "dota", "dota 2", "the international", "ti",
+        # Valorant
+        "valorant", "vct",
+    )),
+]
+# One alternation per sport so each league name is scanned once instead of once per token
+_DEFAULT_LEAGUE_PATTERNS: List[Tuple[Tuple[str, ...], "re.Pattern[str]"]] = [
+    (sport_keys, re.compile("|".join(re.escape(tok) for tok in tokens)))
+    for sport_keys, tokens in _DEFAULT_LEAGUE_TOKENS
+]
+
+
 def _filter_leagues_by_default(leagues: List[Dict[str, Any]], sport_name: str, show_all: bool) -> List[Dict[str, Any]]:
     if show_all:
         return leagues
     s = _normalize(sport_name)
-    # Default filters for US major leagues
-    if "basketball" in s:
-        allowed = ("nba", "ncaa")
-    elif "baseball" in s:
-        allowed = ("mlb", "ncaa")
-    elif "tennis" in s:
-        # Focus on ATP/WTA and Grand Slams
-        allowed = (
-            "atp",
-            "wta",
-            "australian open",
-            "french open",
-            "roland garros",
-            "wimbledon",
-            "us open",
-        )
-    elif ("esport" in s) or ("e-sport" in s) or ("e sport" in s):
-        # Focus on the biggest titles/leagues
-        allowed = (
-            # League of Legends
-            "league of legends", "lol", "lck", "lec", "lpl", "lcs",
-            # CS/Counter-Strike
-            "cs2", "csgo", "counter-strike", "esl", "blast",
-            # Dota 2
-            "dota", "dota 2", "the international", "ti",
-            # Valorant
-            "valorant", "vct",
-        )
-    else:
+    pattern = next((rx for sport_keys, rx in _DEFAULT_LEAGUE_PATTERNS if any(k in s for k in sport_keys)), None)
+    if pattern is None:
         return leagues
-    filtered: List[Dict[str, Any]] = []
-    for lg in leagues:
-        name = _league_name_from(lg)
-        lname = _normalize(name)
-        if any(tok in lname for tok in allowed):
-            filtered.append(lg)
+    search = pattern.search
+    filtered: List[Dict[str, Any]] = [lg for lg in leagues if search(_normalize(_league_name_from(lg)))]
     # Fallback to all if filter removes everything
     return filtered if filtered else leagues
 
 
-def step_choose_league(client: PinnacleOddsClient, sport_id: int, sport_name: str, show_all: bool) -> Tuple[int, str]:
+def step_choose_league(client: "PinnacleOddsClient", sport_id: int, sport_name: str, show_all: bool) -> Tuple[int, str]:
     resp = client.list_leagues(sport_id=sport_id)
     leagues = _extract_items(resp, keys=["leagues", "data", "result", "response"])
     if not leagues:
@@ -443,7 +529,7 @@ def step_choose_year() -> int:
 
 
 def _try_archive(
-    client: PinnacleOddsClient,
+    client: "PinnacleOddsClient",
     sport_id: int,
     page_num: int,
     league_id: Optional[int],
@@ -452,6 +538,7 @@ def _try_archive(
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
 ) -> Any:
+    from requests import HTTPError
     try:
         return client.list_archive_events(
             sport_id=sport_id,
@@ -462,7 +549,7 @@ def _try_archive(
             date_from=date_from,
             date_to=date_to,
         )
-    except requests.HTTPError as http_err:
+    except HTTPError as http_err:
         # Try without league filter if present
         if league_id is not None and http_err.response is not None and http_err.response.status_code == 422:
             return client.list_archive_events(
@@ -477,8 +564,234 @@ def _try_archive(
         raise
 
 
+# On-disk cache of archive page payloads (one JSON file per page and query)
+ARCHIVE_CACHE_DIR = os.path.join("outputs", "_cache")
+# Cache entries written before this epoch are ignored; main() bumps it for --refresh
+_archive_cache_not_before = 0.0
+# Cached pages are reused for this long. The archive is paged newest first, so every page's
+# contents shift whenever new events are archived; no page is ever safe to keep indefinitely.
+ARCHIVE_CACHE_TTL_SECONDS = 3600
+# Recently used pages kept decoded in memory (path -> (stored_at, payload)) for paging back and forth
+ARCHIVE_MEMO_PAGES = 64
+_archive_memo: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+_archive_memo_lock = threading.Lock()
+
+
+def _archive_cache_path(
+    sport_id: int,
+    league_id: Optional[int],
+    page_num: int,
+    page_size: Optional[int],
+    season: Optional[str],
+    date_from: Optional[str],
+    date_to: Optional[str],
+) -> str:
+    query = json.dumps([page_size, season, date_from, date_to])
+    digest = hashlib.sha1(query.encode("utf-8")).hexdigest()[:12]
+    league_dir = str(league_id) if league_id is not None else "all"
+    return os.path.join(ARCHIVE_CACHE_DIR, str(sport_id), league_dir, f"page_{page_num}_{digest}.json")
+
+
+def _archive_page_fresh(stored_at: float, not_before: float = 0.0) -> bool:
+    if stored_at < max(_archive_cache_not_before, not_before):
+        return False
+    return time.time() - stored_at <= ARCHIVE_CACHE_TTL_SECONDS
+
+
+def _remember_archive_page(path: str, stored_at: float, payload: Any) -> None:
+    with _archive_memo_lock:
+        _archive_memo[path] = (stored_at, payload)
+        _archive_memo.move_to_end(path)
+        while len(_archive_memo) > ARCHIVE_MEMO_PAGES:
+            _archive_memo.popitem(last=False)
+
+
+def _store_archive_page(path: str, payload: Any) -> None:
+    events = payload.get("events") if isinstance(payload, dict) else None
+    # Only non-empty pages are stored so the end of the archive is always re-checked
+    if isinstance(events, list) and events:
+        cache_dir = os.path.dirname(path)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(_json_dumps(payload))
+        os.replace(tmp_path, path)
+        _remember_archive_page(path, time.time(), payload)
+
+
+def _page_event_ids(payload: Any) -> List[Any]:
+    events = payload.get("events") if isinstance(payload, dict) else None
+    if not isinstance(events, list):
+        return []
+    return [_get_first(ev, _EID_KEYS) for ev in events if isinstance(ev, dict)]
+
+
+# Archive pages are numbered newest first, so new events shift every cached page. Per query
+# (keyed by its page-1 cache path), entries stored before this epoch belong to an older
+# snapshot; it is set once per run by comparing a fresh page 1 with the cached one.
+_archive_snapshot_since: Dict[str, float] = {}
+_archive_snapshot_lock = threading.Lock()
+
+
+def _archive_snapshot_floor(
+    client: "PinnacleOddsClient",
+    sport_id: int,
+    league_id: Optional[int],
+    page_size: Optional[int],
+    season: Optional[str],
+    date_from: Optional[str],
+    date_to: Optional[str],
+) -> float:
+    first_path = os.path.abspath(_archive_cache_path(sport_id, league_id, 1, page_size, season, date_from, date_to))
+    with _archive_snapshot_lock:
+        floor = _archive_snapshot_since.get(first_path)
+        if floor is not None:
+            return floor
+        cached = None
+        try:
+            if _archive_page_fresh(os.path.getmtime(first_path)):
+                with open(first_path, "r", encoding="utf-8") as f:
+                    cached = _json_loads(f.read())
+        except (OSError, ValueError):
+            pass
+        checked_at = time.time()
+        fresh = _try_archive(
+            client,
+            sport_id=sport_id,
+            page_num=1,
+            league_id=league_id,
+            page_size=page_size,
+            season=season,
+            date_from=date_from,
+            date_to=date_to,
+        )
+        # Unchanged page 1 means nothing new was archived, so the other cached pages still line up
+        unchanged = cached is not None and _page_event_ids(cached) == _page_event_ids(fresh)
+        floor = 0.0 if unchanged else checked_at
+        _archive_snapshot_since[first_path] = floor
+        _store_archive_page(first_path, fresh)
+        return floor
+
+
+def _fetch_page_cached(
+    client: "PinnacleOddsClient",
+    sport_id: int,
+    page_num: int,
+    league_id: Optional[int],
+    page_size: Optional[int] = None,
+    season: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+) -> Any:
+    not_before = _archive_snapshot_floor(client, sport_id, league_id, page_size, season, date_from, date_to)
+    path = os.path.abspath(_archive_cache_path(sport_id, league_id, page_num, page_size, season, date_from, date_to))
+    with _archive_memo_lock:
+        memo = _archive_memo.get(path)
+    if memo is not None and _archive_page_fresh(memo[0], not_before):
+        return memo[1]
+    try:
+        stored_at = os.path.getmtime(path)
+        if _archive_page_fresh(stored_at, not_before):
+            with open(path, "r", encoding="utf-8") as f:
+                payload = _json_loads(f.read())
+            _remember_archive_page(path, stored_at, payload)
+            return payload
+    except (OSError, ValueError):
+        pass
+    payload = _try_archive(
+        client,
+        sport_id=sport_id,
+        page_num=page_num,
+        league_id=league_id,
+        page_size=page_size,
+        season=season,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    _store_archive_page(path, payload)
+    return payload
+
+
+# Aggregate scans stop here when the provider does not report how many pages there are
+AGGREGATE_MAX_PAGES = 200
+
+
+def _archive_last_page(payload: Any) -> Optional[int]:
+    # Advisory last page number from provider paging fields (pages/total_pages/last_page), or
+    # from total items divided by the number of events page 1 actually returned (the requested
+    # page_size is only honoured if the provider supports it)
+    if not isinstance(payload, dict):
+        return None
+    for key in ("pages", "total_pages", "last_page"):
+        pages = _as_int(payload.get(key))
+        if pages is not None and pages > 0:
+            return pages
+    events = payload.get("events")
+    per_page = len(events) if isinstance(events, list) else 0
+    total = _as_int(payload.get("total"))
+    if total is not None and total > 0 and per_page > 0:
+        return -(-total // per_page)
+    return None
+
+
+# Single background worker used by browse_archive to fetch the next page ahead of the user
+_browse_prefetch_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _prefetch_pool() -> ThreadPoolExecutor:
+    global _browse_prefetch_pool
+    if _browse_prefetch_pool is None:
+        _browse_prefetch_pool = ThreadPoolExecutor(max_workers=1)
+    return _browse_prefetch_pool
+
+
+# Number of archive page requests kept in flight by _iter_archive_pages
+ARCHIVE_PREFETCH_WINDOW = 8
+
+
+def _iter_archive_pages(
+    client: "PinnacleOddsClient",
+    sport_id: int,
+    league_id: Optional[int],
+    start_page: int = 1,
+    max_pages: int = 200,
+    page_size: Optional[int] = 250,
+    season: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    window: int = ARCHIVE_PREFETCH_WINDOW,
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (page_num, payload) for start_page..max_pages in page order while keeping up to
+    `window` requests in flight. Errors surface at the page that raised them; pending
+    requests are cancelled as soon as the caller stops iterating.
+    """
+    pending: Dict[int, Future] = {}
+    next_page = start_page
+    with ThreadPoolExecutor(max_workers=max(1, window)) as pool:
+        try:
+            for page in range(start_page, max_pages + 1):
+                while next_page <= max_pages and len(pending) < window:
+                    pending[next_page] = pool.submit(
+                        _fetch_page_cached,
+                        client,
+                        sport_id=sport_id,
+                        page_num=next_page,
+                        league_id=league_id,
+                        page_size=page_size,
+                        season=season,
+                        date_from=date_from,
+                        date_to=date_to,
+                    )
+                    next_page += 1
+                yield page, pending.pop(page).result()
+        finally:
+            for fut in pending.values():
+                fut.cancel()
+
+
 def _list_archive_events_all(
-    client: PinnacleOddsClient,
+    client: "PinnacleOddsClient",
     sport_id: int,
     league_id: Optional[int],
     max_pages: int = 200,
@@ -487,78 +800,113 @@ def _list_archive_events_all(
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
+    from requests import HTTPError
     all_events: List[Dict[str, Any]] = []
-    page_num = 1
     seen_event_ids = set()
-    while page_num <= max_pages:
-        try:
-            payload = _try_archive(
-                client,
-                sport_id=sport_id,
-                page_num=page_num,
-                league_id=league_id,
-                page_size=250,
-                season=season,
-                date_from=date_from,
-                date_to=date_to,
-            )
-        except requests.HTTPError as http_err:
-            # Give a clearer message including server response
-            body = getattr(http_err.response, "text", "") if http_err.response is not None else ""
-            raise RuntimeError(f"Archive rejected (status {getattr(http_err.response, 'status_code', '?')}): {body}")
-        events = payload.get("events") if isinstance(payload, dict) else None
-        if not isinstance(events, list) or not events:
-            break
-        if debug:
-            starts_list = [str(_get_first(e, ["starts", "start_time", "startTime"], "")) for e in events if isinstance(e, dict)]
-            dts = [dt for dt in (_parse_iso_utc(s) for s in starts_list) if dt is not None]
-            min_dt = min(dts).isoformat() if dts else "?"
-            max_dt = max(dts).isoformat() if dts else "?"
-            print(f"[debug] archive page {page_num}: events={len(events)} date_range=[{min_dt} .. {max_dt}]")
-        for ev in events:
-            try:
-                eid = int(ev.get("event_id") or 0)
-            except Exception:
-                continue
-            if eid and eid not in seen_event_ids:
-                all_events.append(ev)
-                seen_event_ids.add(eid)
-        # Advance page number
-        page_num += 1
+    pages = _iter_archive_pages(
+        client,
+        sport_id=sport_id,
+        league_id=league_id,
+        max_pages=max_pages,
+        season=season,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    try:
+        for page_num, payload in pages:
+            events = payload.get("events") if isinstance(payload, dict) else None
+            if not isinstance(events, list) or not events:
+                break
+            if debug:
+                starts_list = [str(_get_first(e, _STARTS_KEYS, "")) for e in events if isinstance(e, dict)]
+                dts = [dt for dt in _parse_iso_utc_batch(starts_list) if dt is not None]
+                min_dt = min(dts).isoformat() if dts else "?"
+                max_dt = max(dts).isoformat() if dts else "?"
+                print(f"[debug] archive page {page_num}: events={len(events)} date_range=[{min_dt} .. {max_dt}]")
+            for ev in events:
+                eid = _as_int(ev.get("event_id") or 0)
+                if eid and eid not in seen_event_ids:
+                    all_events.append(ev)
+                    seen_event_ids.add(eid)
+    except HTTPError as http_err:
+        # Give a clearer message including server response
+        body = getattr(http_err.response, "text", "") if http_err.response is not None else ""
+        raise RuntimeError(f"Archive rejected (status {getattr(http_err.response, 'status_code', '?')}): {body}")
+    finally:
+        pages.close()
     return all_events
 
 
-def _write_year_csv(year_to_events: Dict[int, Dict[int, Dict[str, Any]]], out_dir: str, league_name: str, year: int) -> None:
-    events_by_id = year_to_events.get(year, {})
-    rows = []
-    for eid, ev in events_by_id.items():
-        rows.append({
-            "event_id": eid,
-            "league_id": _get_first(ev, ["league_id", "leagueId"]),
-            "starts": _get_first(ev, ["starts", "start_time", "startTime"]),
-            "home": ev.get("home"),
-            "away": ev.get("away"),
-        })
-    rows.sort(key=lambda r: str(r.get("starts") or ""))
+# Per-year CSV row in header order: (event_id, league_id, starts, home, away).
+# starts is normalized to a string up front so rows sort without a key lambda.
+_YearRow = Tuple[int, Any, str, Any, Any]
+
+
+def _year_row(eid: int, ev: Dict[str, Any], starts: str) -> _YearRow:
+    return (eid, _ev_league_id(ev), starts, ev.get("home"), ev.get("away"))
+
+
+def _write_year_csv(year_to_events: Dict[int, Dict[int, _YearRow]], out_dir: str, league_name: str, year: int) -> None:
+    rows = sorted(year_to_events.get(year, {}).values(), key=itemgetter(2))
     os.makedirs(out_dir, exist_ok=True)
     out_path = os.path.join(out_dir, f"{_sanitize_name(league_name)}_{year}.csv")
-    with open(out_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["event_id", "league_id", "starts", "home", "away"])
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+    with open(out_path, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(["event_id", "league_id", "starts", "home", "away"])
+        writer.writerows(rows)
+
+
+def _write_sorted_csv(unsorted_path: str, out_path: str, header: List[str], key_col: int) -> None:
+    # Final pass for CSVs streamed out in arrival order: stable sort on one column, then
+    # write header + rows to out_path. The unsorted scratch file is always removed.
+    try:
+        with open(unsorted_path, "r", newline="", encoding="utf-8") as f:
+            rows = sorted(csv.reader(f), key=itemgetter(key_col))
+        with open(out_path, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+    finally:
+        os.remove(unsorted_path)
 
 
 def _page_date_range(events: List[Dict[str, Any]]) -> Tuple[Optional[datetime], Optional[datetime]]:
-    starts_list = [str(_get_first(e, ["starts", "start_time", "startTime"], "")) for e in events if isinstance(e, dict)]
-    dts = [dt for dt in (_parse_iso_utc(s) for s in starts_list) if dt is not None]
+    starts_list = [str(_get_first(e, _STARTS_KEYS, "")) for e in events if isinstance(e, dict)]
+    dts = [dt for dt in _parse_iso_utc_batch(starts_list) if dt is not None]
     if not dts:
         return None, None
     return min(dts), max(dts)
 
 
+# main() clears this for --no-bisect to seek years with the plain forward page scan
+_seek_bisect = True
+
+
+def _inspect_seek_page(
+    page: int,
+    events: List[Dict[str, Any]],
+    target_year: int,
+    page_bounds: Optional[Dict[int, Tuple[datetime, datetime]]],
+    debug: bool,
+) -> Tuple[bool, Optional[datetime], Optional[datetime]]:
+    # (page has an event in target_year, earliest start, latest start); records page_bounds
+    found = False
+    for ev in events:
+        starts = _ev_starts(ev)
+        dt = _parse_iso_utc(str(starts or ""))
+        if dt is not None and dt.year == target_year:
+            found = True
+            break
+    min_dt, max_dt = _page_date_range(events)
+    if page_bounds is not None and min_dt is not None and max_dt is not None:
+        page_bounds[page] = (min_dt, max_dt)
+    if debug:
+        print(f"[debug] seek page {page}: date_range=[{min_dt.isoformat() if min_dt else '?'} .. {max_dt.isoformat() if max_dt else '?'}], found_year={found}")
+    return found, min_dt, max_dt
+
+
 def _find_page_for_year(
-    client: PinnacleOddsClient,
+    client: "PinnacleOddsClient",
     sport_id: int,
     league_id: int,
     target_year: int,
@@ -567,11 +915,24 @@ def _find_page_for_year(
     season: Optional[str] = None,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
+    start_page: int = 1,
+    page_bounds: Optional[Dict[int, Tuple[datetime, datetime]]] = None,
 ) -> Optional[int]:
-    page = 1
-    while page <= max_pages:
+    # Provider ordering appears newest -> older with increasing page_num, so the first page
+    # holding target_year is found by galloping forward (start, +1, +2, +4, ...) until a page
+    # is no longer entirely newer than the target, then bisecting the last gap.
+    # Date ranges of probed pages are recorded into page_bounds when given.
+    from requests import HTTPError
+    if not _seek_bisect:
+        return _scan_page_for_year(
+            client, sport_id, league_id, target_year, max_pages, debug,
+            season, date_from, date_to, start_page, page_bounds,
+        )
+
+    def _probe(page: int) -> Optional[Tuple[bool, Optional[datetime], Optional[datetime]]]:
+        # None past the end of the archive (empty page or rejected request)
         try:
-            payload = _try_archive(
+            payload = _fetch_page_cached(
                 client,
                 sport_id=sport_id,
                 page_num=page,
@@ -581,43 +942,166 @@ def _find_page_for_year(
                 date_from=date_from,
                 date_to=date_to,
             )
-        except requests.HTTPError:
-            break
+        except HTTPError:
+            return None
         events = payload.get("events") if isinstance(payload, dict) else None
         if not isinstance(events, list) or len(events) == 0:
+            return None
+        return _inspect_seek_page(page, events, target_year, page_bounds, debug)
+
+    def _newer(info: Optional[Tuple[bool, Optional[datetime], Optional[datetime]]]) -> bool:
+        # Whole page is more recent than target_year (pages without dates count as newer)
+        return info is not None and not info[0] and (info[1] is None or info[1].year > target_year)
+
+    if start_page > max_pages:
+        return None
+    info = _probe(start_page)
+    if info is None:
+        return None
+    if info[0]:
+        return start_page
+    if not _newer(info):
+        return None
+    # Gallop: `newer` is the last page known to be newer, `hi` the first known not to be
+    newer = start_page
+    hi = max_pages + 1
+    step = 1
+    while start_page + step <= max_pages:
+        probe = start_page + step
+        info = _probe(probe)
+        if not _newer(info):
+            if info is not None and info[0] and probe == newer + 1:
+                return probe
+            hi = probe
             break
-        # quick check for any in target year
-        found = False
-        for ev in events:
-            dt = _parse_iso_utc(str(_get_first(ev, ["starts", "start_time", "startTime"], "") or ""))
-            if dt is not None and dt.year == target_year:
-                found = True
+        newer = probe
+        step *= 2
+    # Bisect (newer, hi) for the first page that is not newer than target_year
+    while hi - newer > 1:
+        mid = (newer + hi) // 2
+        if _newer(_probe(mid)):
+            newer = mid
+        else:
+            hi = mid
+    if hi > max_pages:
+        return None
+    info = _probe(hi)
+    if info is not None and info[0]:
+        return hi
+    return None
+
+
+def _scan_page_for_year(
+    client: "PinnacleOddsClient",
+    sport_id: int,
+    league_id: int,
+    target_year: int,
+    max_pages: int,
+    debug: bool,
+    season: Optional[str],
+    date_from: Optional[str],
+    date_to: Optional[str],
+    start_page: int,
+    page_bounds: Optional[Dict[int, Tuple[datetime, datetime]]],
+) -> Optional[int]:
+    # Plain forward scan; pages are prefetched and the generator cancels outstanding
+    # requests on a hit
+    from requests import HTTPError
+    pages = _iter_archive_pages(
+        client,
+        sport_id=sport_id,
+        league_id=league_id,
+        start_page=start_page,
+        max_pages=max_pages,
+        season=season,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    try:
+        for page, payload in pages:
+            events = payload.get("events") if isinstance(payload, dict) else None
+            if not isinstance(events, list) or len(events) == 0:
                 break
-        min_dt, max_dt = _page_date_range(events)
-        if debug:
-            print(f"[debug] seek page {page}: date_range=[{min_dt.isoformat() if min_dt else '?'} .. {max_dt.isoformat() if max_dt else '?'}], found_year={found}")
-        if found:
-            return page
-        # If everything on this page is newer than target, go to older pages (page+1)
-        # We always advance; provider ordering appears newest -> older with increasing page_num
-        page += 1
+            found, _, _ = _inspect_seek_page(page, events, target_year, page_bounds, debug)
+            if found:
+                return page
+    except HTTPError:
+        pass
+    finally:
+        pages.close()
     return None
 
 
+def _page_league_index(events: List[Dict[str, Any]]) -> Dict[int, List[int]]:
+    # league_id -> positions of that league's events on an archive page, in page order
+    index: Dict[int, List[int]] = {}
+    for pos, ev in enumerate(events):
+        lid = _ev_league_id(ev)
+        lid = _as_int(lid or 0)
+        if lid is None:
+            continue
+        if lid in index:
+            index[lid].append(pos)
+        else:
+            index[lid] = [pos]
+    return index
+
+
+def _seek_year_in_bounds(page_bounds: Dict[int, Tuple[datetime, datetime]], target_year: int) -> Tuple[Optional[int], int]:
+    # Binary search over known page date ranges (pages run newest -> older).
+    # Returns (page, start_page): page when the known bounds already pin down the first page
+    # holding a target_year event, otherwise the first page still worth scanning.
+    known = sorted(page_bounds)
+    lo, hi = 0, len(known)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if page_bounds[known[mid]][0].year > target_year:
+            lo = mid + 1
+        else:
+            hi = mid
+    start_page = known[lo - 1] + 1 if lo > 0 else 1
+    if lo < len(known) and known[lo] == start_page:
+        # A range that merely spans target_year may skip it; only an endpoint in that year
+        # proves the page has a target_year event (the seek verifies anything else)
+        min_dt, max_dt = page_bounds[known[lo]]
+        if min_dt.year == target_year or max_dt.year == target_year:
+            return known[lo], start_page
+    return None, start_page
+
+
 def browse_archive(
-    client: PinnacleOddsClient,
+    client: "PinnacleOddsClient",
     sport_id: int,
     sport_name: str,
     league_id: int,
     league_name: str,
     start_year: Optional[int] = None,
     debug: bool = False,
+    raw: bool = False,
 ) -> Optional[int]:
-    # Interactive pager with per-year CSV dumps to outputs/<sport>/<league>/
+    # Interactive pager with per-year CSV dumps to outputs/<sport>/<league>/;
+    # with raw=True the aggregate command also writes each full event to a gzipped JSONL sidecar
+    from requests import HTTPError
     _header("Browse Archive Pages", "📚")
     out_dir = _ensure_output_dir(sport_name, league_name)
     page_num = 1
-    year_to_events: Dict[int, Dict[int, Dict[str, Any]]] = {}
+    year_to_events: Dict[int, Dict[int, _YearRow]] = {}
+    # What is already known per page (for the browse query): date range and league index.
+    # The index is stored with the exact events list it was built from: a re-fetched page
+    # (TTL expiry, or new events shifting the newest-first pages) is a new list and is
+    # re-indexed, while pages still in the in-memory memo come back as the same list.
+    page_bounds: Dict[int, Tuple[datetime, datetime]] = {}
+    page_league_index: Dict[int, Tuple[List[Dict[str, Any]], Dict[int, List[int]]]] = {}
+
+    def _league_positions(page: int, page_events_all: List[Dict[str, Any]]) -> List[int]:
+        if not page_events_all:
+            return []
+        cached = page_league_index.get(page)
+        if cached is None or cached[0] is not page_events_all:
+            cached = (page_events_all, _page_league_index(page_events_all))
+            page_league_index[page] = cached
+        return cached[1].get(league_id, [])
+
     show_only_selected = True  # toggle to show all events vs only selected league
     # If user specified a target year, try to seek to a page containing that year
     season = None
@@ -640,6 +1124,7 @@ def browse_archive(
             season=season,
             date_from=date_from,
             date_to=date_to,
+            page_bounds=page_bounds,
         )
         if sought is not None:
             page_num = sought
@@ -647,57 +1132,59 @@ def browse_archive(
                 print(f"[debug] jumped to page {page_num} for year {start_year}")
         else:
             print(f"(Could not locate pages for year {start_year}; starting at page 1)")
+    # (page_num, future) of the next page, fetched in the background while the user reads
+    prefetched: Optional[Tuple[int, Future]] = None
     while True:
         try:
-            payload = _try_archive(
-                client,
-                sport_id=sport_id,
-                page_num=page_num,
-                league_id=league_id,
-                page_size=250,
-                season=season,
-                date_from=date_from,
-                date_to=date_to,
-            )
-        except requests.HTTPError as http_err:
+            if prefetched is not None and prefetched[0] == page_num:
+                payload = prefetched[1].result()
+            else:
+                payload = _fetch_page_cached(
+                    client,
+                    sport_id=sport_id,
+                    page_num=page_num,
+                    league_id=league_id,
+                    page_size=250,
+                    season=season,
+                    date_from=date_from,
+                    date_to=date_to,
+                )
+        except HTTPError as http_err:
             body = getattr(http_err.response, "text", "") if http_err.response is not None else ""
             print(f"Error fetching archive (status {getattr(http_err.response, 'status_code', '?')}): {body}")
             return None
         events = payload.get("events") if isinstance(payload, dict) else None
         if not isinstance(events, list):
             events = []
-        # Client-filter by league_id
-        page_events: List[Dict[str, Any]] = []
-        for ev in events:
-            try:
-                lid = int(_get_first(ev, ["league_id", "leagueId"], 0) or 0)
-            except Exception:
-                continue
-            if lid != league_id:
-                continue
-            page_events.append(ev)
-
-        # Update per-year cache and write CSVs for any years present on this page
-        years_seen_this_page = set()
+        # Client-filter by league_id through the (cached) per-page league index
+        page_events: List[Dict[str, Any]] = [events[pos] for pos in _league_positions(page_num, events)]
+        if events:
+            min_dt, max_dt = _page_date_range(events)
+            if min_dt is not None and max_dt is not None:
+                page_bounds[page_num] = (min_dt, max_dt)
+
+        # Update per-year cache; only years whose events actually changed are rewritten,
+        # so revisiting pages does not rewrite whole year files
+        changed_years = set()
         for ev in page_events:
-            starts = str(_get_first(ev, ["starts", "start_time", "startTime"], "") or "")
+            starts = _ev_starts(ev)
+            starts = str(starts or "")
             dt = _parse_iso_utc(starts)
             if dt is None:
                 continue
-            yr = int(dt.year)
-            years_seen_this_page.add(yr)
-            eid_val = _get_first(ev, ["event_id", "eventId"], None)
-            try:
-                eid = int(eid_val) if eid_val is not None else None
-            except Exception:
-                eid = None
+            yr = dt.year
+            eid_val = _ev_event_id(ev)
+            eid = _as_int(eid_val)
             if not eid:
                 continue
             if yr not in year_to_events:
                 year_to_events[yr] = {}
-            year_to_events[yr][eid] = ev
+            row = _year_row(eid, ev, starts)
+            if year_to_events[yr].get(eid) != row:
+                year_to_events[yr][eid] = row
+                changed_years.add(yr)
 
-        for yr in sorted(years_seen_this_page):
+        for yr in sorted(changed_years):
             if debug:
                 print(f"[debug] writing {os.path.join(out_dir, f'{_sanitize_name(league_name)}_{yr}.csv')} with {len(year_to_events.get(yr, {}))} events")
             _write_year_csv(year_to_events, out_dir, league_name, yr)
@@ -705,10 +1192,10 @@ def browse_archive(
         # Show the page list
         _header(f"Page {page_num}", "📄")
         if debug:
-            dts = [
-                _parse_iso_utc(str(_get_first(ev, ["starts", "start_time", "startTime"], "") or ""))
+            dts = _parse_iso_utc_batch([
+                str(_get_first(ev, _STARTS_KEYS, "") or "")
                 for ev in (page_events if show_only_selected else events)
-            ]
+            ])
             dts = [dt for dt in dts if dt is not None]
             if dts:
                 print(f"[debug] page date_range=[{min(dts).isoformat()} .. {max(dts).isoformat()}]")
@@ -720,16 +1207,28 @@ def browse_archive(
         options: List[Tuple[str, Any]] = []
         display_events = page_events if show_only_selected else events
         for ev in display_events:
-            eid = _get_first(ev, ["event_id", "eventId"])  # raw
+            eid = _get_first(ev, _EID_KEYS)  # raw
             home = str(ev.get("home") or "")
             away = str(ev.get("away") or "")
             if _is_test_event(ev):
                 continue
-            starts = str(_get_first(ev, ["starts", "start_time", "startTime"], "") or "")
+            starts = str(_get_first(ev, _STARTS_KEYS, "") or "")
             league_label = league_name or str(_get_first(ev, ["league_name", "leagueName"], ""))
             options.append((f"{starts} | {league_label} | {home} vs {away} | event_id={eid}", eid))
         for idx, (label, _) in enumerate(options, start=1):
             print(f"  {idx}. {label}")
+        if events and (prefetched is None or prefetched[0] != page_num + 1):
+            prefetched = (page_num + 1, _prefetch_pool().submit(
+                _fetch_page_cached,
+                client,
+                sport_id=sport_id,
+                page_num=page_num + 1,
+                league_id=league_id,
+                page_size=250,
+                season=season,
+                date_from=date_from,
+                date_to=date_to,
+            ))
         print("\nCommands: [number]=select  n=next  p=prev  j=jump  y=year  t=toggle  f=find-next  b=find-prev  a=all-league  q=quit")
         cmd = input("Enter command: ").strip().lower()
         if cmd == "n":
@@ -752,7 +1251,14 @@ def browse_archive(
             where = input("Jump to year (YYYY): ").strip()
             try:
                 target_y = int(where)
-                sought = _find_page_for_year(client, sport_id=sport_id, league_id=league_id, target_year=target_y, debug=debug)
+                sought = None
+                if season is None and date_from is None and date_to is None:
+                    # Known bounds describe the same unfiltered query, so bisect them first
+                    sought, start = _seek_year_in_bounds(page_bounds, target_y)
+                    if sought is None:
+                        sought = _find_page_for_year(client, sport_id=sport_id, league_id=league_id, target_year=target_y, debug=debug, start_page=start, page_bounds=page_bounds)
+                else:
+                    sought = _find_page_for_year(client, sport_id=sport_id, league_id=league_id, target_year=target_y, debug=debug)
                 if sought is not None:
                     page_num = sought
                 else:
@@ -768,8 +1274,9 @@ def browse_archive(
             probe = page_num + 1
             found = False
             while True:
+                # Memo hits return the same events list, so its league index is reused as is
                 try:
-                    payload2 = _try_archive(
+                    payload2 = _fetch_page_cached(
                         client,
                         sport_id=sport_id,
                         page_num=probe,
@@ -779,21 +1286,12 @@ def browse_archive(
                         date_from=date_from,
                         date_to=date_to,
                     )
-                except requests.HTTPError:
+                except HTTPError:
                     break
                 events2 = payload2.get("events") if isinstance(payload2, dict) else None
                 if not isinstance(events2, list) or len(events2) == 0:
                     break
-                any_match = False
-                for ev in events2:
-                    try:
-                        lid = int(_get_first(ev, ["league_id", "leagueId"], 0) or 0)
-                    except Exception:
-                        continue
-                    if lid == league_id:
-                        any_match = True
-                        break
-                if any_match:
+                if _league_positions(probe, events2):
                     page_num = probe
                     found = True
                     break
@@ -807,7 +1305,7 @@ def browse_archive(
             found = False
             while probe >= 1:
                 try:
-                    payload2 = _try_archive(
+                    payload2 = _fetch_page_cached(
                         client,
                         sport_id=sport_id,
                         page_num=probe,
@@ -817,22 +1315,13 @@ def browse_archive(
                         date_from=date_from,
                         date_to=date_to,
                     )
-                except requests.HTTPError:
+                except HTTPError:
                     break
                 events2 = payload2.get("events") if isinstance(payload2, dict) else None
                 if not isinstance(events2, list) or len(events2) == 0:
                     probe -= 1
                     continue
-                any_match = False
-                for ev in events2:
-                    try:
-                        lid = int(_get_first(ev, ["league_id", "leagueId"], 0) or 0)
-                    except Exception:
-                        continue
-                    if lid == league_id:
-                        any_match = True
-                        break
-                if any_match:
+                if _league_positions(probe, events2):
                     page_num = probe
                     found = True
                     break
@@ -862,81 +1351,106 @@ def browse_archive(
                 # Aggregate all events for this league across all pages without any date filters
                 print("Aggregating all events for this league across available pages (no date filters)...")
                 out_dir = _ensure_output_dir(sport_name, league_name)
-                year_to_events: Dict[int, Dict[int, Dict[str, Any]]] = {}
-                all_rows: List[Tuple[str, str, str, int]] = []  # (starts, home, away, event_id)
-                probe = 1
+                year_to_events: Dict[int, Dict[int, _YearRow]] = {}
                 gathered = 0
-                max_pages_scan = 5000
-                while probe <= max_pages_scan:
+                # Page 1 hints how far to go when the provider reports paging info (one page past
+                # the hint is probed in case it is low); otherwise stop at the first empty page,
+                # capped at AGGREGATE_MAX_PAGES
+                try:
+                    first_payload = _fetch_page_cached(client, sport_id=sport_id, page_num=1, league_id=league_id, page_size=250)
+                except HTTPError:
+                    first_payload = None
+                last_page = _archive_last_page(first_payload)
+                max_pages_scan = last_page + 1 if last_page is not None else AGGREGATE_MAX_PAGES
+                stopped_at_cap = False
+                combined_path = os.path.join(out_dir, f"{_sanitize_name(league_name)}_all.csv")
+                # Combined rows are streamed to a scratch file as pages arrive (only one page is
+                # held in memory) and ordered by starts in a final pass
+                fd, unsorted_path = tempfile.mkstemp(dir=out_dir, prefix=".unsorted_", suffix=".csv")
+                unsorted_f = os.fdopen(fd, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE)
+                # Any error before the sort step (connection error, bad JSON, Ctrl-C) must not
+                # leave the scratch file behind in the league folder
+                reached_sort = False
+                try:
+                    unsorted_writer = csv.writer(unsorted_f)
+                    raw_path = os.path.join(out_dir, f"{_sanitize_name(league_name)}_all_raw.jsonl.gz")
+                    raw_f = gzip.open(raw_path, "wt", encoding="utf-8") if raw else None
+                    # Pages are prefetched concurrently but consumed in order
+                    pages = _iter_archive_pages(
+                        client,
+                        sport_id=sport_id,
+                        league_id=league_id,
+                        max_pages=max_pages_scan,
+                        page_size=250,
+                    )
                     try:
-                        payload2 = _try_archive(
-                            client,
-                            sport_id=sport_id,
-                            page_num=probe,
-                            league_id=league_id,
-                            page_size=250,
-                            season=None,
-                            date_from=None,
-                            date_to=None,
-                        )
-                    except requests.HTTPError:
-                        break
-                    events2 = payload2.get("events") if isinstance(payload2, dict) else None
-                    if not isinstance(events2, list) or len(events2) == 0:
-                        break
-                    page_added = 0
-                    for ev in events2:
-                        try:
-                            lid2 = int(_get_first(ev, ["league_id", "leagueId"], 0) or 0)
-                        except Exception:
-                            continue
-                        if lid2 != league_id:
-                            continue
-                        starts = str(_get_first(ev, ["starts", "start_time", "startTime"], "") or "")
-                        dt = _parse_iso_utc(starts)
-                        year_key = dt.year if dt is not None else None
-                        eid_val = _get_first(ev, ["event_id", "eventId"], None)
+                        for page2, payload2 in pages:
+                            events2 = payload2.get("events") if isinstance(payload2, dict) else None
+                            if not isinstance(events2, list) or len(events2) == 0:
+                                break
+                            # Reaching the page limit without an empty page or has_next == false
+                            # means later pages may exist
+                            stopped_at_cap = page2 == max_pages_scan
+                            page_added = 0
+                            for ev in events2:
+                                lid2 = _ev_league_id(ev)
+                                if _as_int(lid2 or 0) != league_id:
+                                    continue
+                                starts = _ev_starts(ev)
+                                # Provider values are already strings; only coerce the odd non-str
+                                if not isinstance(starts, str):
+                                    starts = str(starts or "")
+                                dt = _parse_iso_utc(starts)
+                                year_key = dt.year if dt is not None else None
+                                eid_val = _ev_event_id(ev)
+                                eid = _as_int(eid_val)
+                                if not eid:
+                                    continue
+                                home = ev.get("home") or ""
+                                away = ev.get("away") or ""
+                                unsorted_writer.writerow([eid, starts, home, away])
+                                if raw_f is not None:
+                                    raw_f.write(_json_dumps({"event_id": eid, "event": ev}) + "\n")
+                                if year_key is not None:
+                                    if year_key not in year_to_events:
+                                        year_to_events[year_key] = {}
+                                    year_to_events[year_key][eid] = _year_row(eid, ev, starts)
+                                gathered += 1
+                                page_added += 1
+                            if isinstance(payload2, dict) and payload2.get("has_next") is False:
+                                stopped_at_cap = False
+                                break
+                    except HTTPError:
+                        pass
+                    finally:
+                        pages.close()
+                        unsorted_f.close()
+                        if raw_f is not None:
+                            raw_f.close()
+                    if stopped_at_cap:
+                        print(f"(Stopped after {max_pages_scan} pages; later pages were not scanned)")
+                    # Write combined CSV ordered by starts (this step removes the scratch file itself)
+                    reached_sort = True
+                    _write_sorted_csv(unsorted_path, combined_path, ["event_id", "starts", "home", "away"], key_col=1)
+                finally:
+                    if not reached_sort:
+                        unsorted_f.close()
                         try:
-                            eid = int(eid_val) if eid_val is not None else None
-                        except Exception:
-                            eid = None
-                        if not eid:
-                            continue
-                        home = str(ev.get("home") or "")
-                        away = str(ev.get("away") or "")
-                        all_rows.append((starts, home, away, eid))
-                        if year_key is not None:
-                            if year_key not in year_to_events:
-                                year_to_events[year_key] = {}
-                            year_to_events[year_key][eid] = ev
-                        gathered += 1
-                        page_added += 1
-                    # Debug printing not available here (args not in scope)
-                    probe += 1
-                # Write combined CSV
-                combined_path = os.path.join(out_dir, f"{_sanitize_name(league_name)}_all.csv")
-                # Export raw JSON for each event as first step for inspection
-                with open(combined_path, "w", newline="", encoding="utf-8") as f:
-                    writer = csv.writer(f)
-                    writer.writerow(["event_id", "starts", "home", "away", "raw_event_json"])
-                    for starts, home, away, eid in sorted(all_rows, key=lambda r: r[0]):
-                        raw = {}
-                        # find the event dict again to serialize minimally
-                        # (this is acceptable performance for CSV generation)
-                        # We won't filter tests here since we already filtered in display above.
-                        # Note: For large datasets, consider accumulating dicts alongside all_rows.
-                        raw = {"event_id": eid, "starts": starts, "home": home, "away": away}
-                        writer.writerow([eid, starts, home, away, json.dumps(raw)])
+                            os.remove(unsorted_path)
+                        except OSError:
+                            pass
                 # Write per-year CSVs
                 for yr in sorted(year_to_events.keys()):
                     _write_year_csv(year_to_events, out_dir, league_name, yr)
                 print(f"Done. Wrote {gathered} events to {combined_path} and per-year files.")
+                if raw:
+                    print(f"Raw events written to {raw_path}")
                 continue
             print("❌ Unknown command")
         # loop continues
 
 
-def _list_events_via_markets(client: PinnacleOddsClient, sport_id: int, debug: bool = False) -> List[Dict[str, Any]]:
+def _list_events_via_markets(client: "PinnacleOddsClient", sport_id: int, debug: bool = False) -> List[Dict[str, Any]]:
     collected: Dict[int, Dict[str, Any]] = {}
     for et in ("prematch", "live", None):
         payload = client.list_markets(sport_id=sport_id, event_type=et, is_have_odds=None)
@@ -946,18 +1460,15 @@ def _list_events_via_markets(client: PinnacleOddsClient, sport_id: int, debug: b
         if debug:
             print(f"[debug] list_markets et={et!r} -> {len(events)} events")
         for ev in events:
-            try:
-                eid = int(_get_first(ev, ["event_id", "eventId"], 0) or 0)
-            except Exception:
-                continue
-            if eid > 0:
+            eid = _as_int(_get_first(ev, _EID_KEYS, 0) or 0)
+            if eid is not None and eid > 0:
                 collected[eid] = ev
     if debug:
         print(f"[debug] markets collected unique events: {len(collected)}")
     return list(collected.values())
 
 
-def step_choose_event(client: PinnacleOddsClient, sport_id: int, league_id: int, year: int, debug: bool = False) -> int:
+def step_choose_event(client: "PinnacleOddsClient", sport_id: int, league_id: int, year: int, debug: bool = False) -> int:
     print("Fetching events. This may take a moment...")
     # Try archive first; if it fails or returns nothing, fallback to markets
     events: List[Dict[str, Any]] = []
@@ -975,14 +1486,11 @@ def step_choose_event(client: PinnacleOddsClient, sport_id: int, league_id: int,
     # Filter by league and year
     filtered: List[Dict[str, Any]] = []
     for ev in events:
-        try:
-            lid = int(_get_first(ev, ["league_id", "leagueId"], 0) or 0)
-        except Exception:
+        lid = _ev_league_id(ev)
+        if _as_int(lid or 0) != league_id:
             continue
-        if lid != league_id:
-            continue
-        starts = str(_get_first(ev, ["starts", "start_time", "startTime"], "") or "")
-        dt = _parse_iso_utc(starts)
+        starts = _ev_starts(ev)
+        dt = _parse_iso_utc(str(starts or ""))
         if dt is None or dt.year != year:
             continue
         filtered.append(ev)
@@ -993,23 +1501,25 @@ def step_choose_event(client: PinnacleOddsClient, sport_id: int, league_id: int,
             print(f"[debug] no filtered events for year={year}, league_id={league_id}. Showing sample of {min(5, len(events))} events:")
             for ev in events[:5]:
                 print({
-                    "event_id": _get_first(ev, ["event_id", "eventId"]),
-                    "league_id": _get_first(ev, ["league_id", "leagueId"]),
-                    "starts": _get_first(ev, ["starts", "start_time", "startTime"]),
+                    "event_id": _get_first(ev, _EID_KEYS),
+                    "league_id": _get_first(ev, _LID_KEYS),
+                    "starts": _get_first(ev, _STARTS_KEYS),
                     "home": ev.get("home"),
                     "away": ev.get("away"),
                 })
         raise RuntimeError("No events found for that league and year.")
 
     options: List[Tuple[str, int]] = []
-    for ev in sorted(filtered, key=lambda e: str(e.get("starts") or "")):
-        try:
-            eid = int(ev.get("event_id") or 0)
-        except Exception:
+    # Sort on a precomputed starts column; the same strings are reused for the labels
+    starts_col = [str(ev.get("starts") or "") for ev in filtered]
+    for i in sorted(range(len(filtered)), key=starts_col.__getitem__):
+        ev = filtered[i]
+        eid = _as_int(ev.get("event_id") or 0)
+        if eid is None:
             continue
         home = str(ev.get("home") or "")
         away = str(ev.get("away") or "")
-        starts = str(ev.get("starts") or "")
+        starts = starts_col[i]
         options.append((f"{starts} | {home} vs {away} | event_id={eid}", eid))
     return choose_from_list("Choose an Event", options, emoji="📅")
 
@@ -1019,18 +1529,25 @@ def _find_histories(node: Any, path: str) -> List[Tuple[str, Any]]:
     Return list of (path, history_collection) where key endswith _history.
     Supports both list-of-dicts and dict-of-(list-of-dicts).
     """
+    # Iterative pre-order walk (same order as a recursive one); scalar leaves are only
+    # visited when their key is a *_history key, so no path strings are built for them
     found: List[Tuple[str, Any]] = []
-    if isinstance(node, dict):
-        for k, v in node.items():
-            p = f"{path}.{k}" if path else k
-            if isinstance(k, str) and k.endswith("_history"):
-                found.append((p, v))
-            # continue walking for nested structures
-            found.extend(_find_histories(v, p))
-    elif isinstance(node, list):
-        for i, v in enumerate(node):
-            p = f"{path}[{i}]"
-            found.extend(_find_histories(v, p))
+    stack: List[Tuple[Any, Any, bool]] = [(node, path, False)]
+    while stack:
+        node, path, is_history = stack.pop()
+        if is_history:
+            found.append((path, node))
+        if isinstance(node, dict):
+            children = []
+            for k, v in node.items():
+                hist = isinstance(k, str) and k.endswith("_history")
+                if hist or isinstance(v, (dict, list)):
+                    children.append((v, f"{path}.{k}" if path else k, hist))
+            stack.extend(reversed(children))
+        elif isinstance(node, list):
+            stack.extend(reversed([
+                (v, f"{path}[{i}]", False) for i, v in enumerate(node) if isinstance(v, (dict, list))
+            ]))
     return found
 
 
@@ -1063,7 +1580,7 @@ def _pick_timestamp(obj: Dict[str, Any]) -> Optional[str]:
     return None
 
 
-def export_event_history_to_csv(client: PinnacleOddsClient, event_id: int, output_path: str) -> None:
+def export_event_history_to_csv(client: "PinnacleOddsClient", event_id: int, output_path: str) -> None:
     details = client.event_details(event_id=event_id)
     histories = _find_histories(details, path="")
     all_rows: List[Dict[str, Any]] = []
@@ -1072,11 +1589,10 @@ def export_event_history_to_csv(client: PinnacleOddsClient, event_id: int, outpu
 
     if not all_rows:
         # Fallback: write a single JSON snapshot row
-        with open(output_path, "w", newline="", encoding="utf-8") as f:
+        with open(output_path, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE) as f:
             w = csv.writer(f)
             w.writerow(["note", "details_json"])
-            import json as _json
-            w.writerow(["no *_history arrays found; writing raw details", _json.dumps(details)])
+            w.writerow(["no *_history arrays found; writing raw details", _json_dumps(details)])
         return
 
     # Normalize columns
@@ -1085,23 +1601,21 @@ def export_event_history_to_csv(client: PinnacleOddsClient, event_id: int, outpu
     # Collect other keys present
     other_keys = set()
     for r in all_rows:
-        for k in r.keys():
-            if k not in ("path", "line_key") and k != "timestamp":
-                other_keys.add(k)
+        other_keys.update(r)
+    other_keys.difference_update(fieldnames)
     # Try to place common keys early
     preferred = ["home", "away", "draw", "over", "under", "price", "odds", "points", "handicap", "line", "value"]
     ordered_others = [k for k in preferred if k in other_keys] + sorted(k for k in other_keys if k not in preferred)
     fieldnames.extend(ordered_others)
 
-    with open(output_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in all_rows:
-            out = {k: r.get(k) for k in ("path", "line_key")}
-            out["timestamp"] = _pick_timestamp(r)
-            for k in ordered_others:
-                out[k] = r.get(k)
-            writer.writerow(out)
+    # Positional rows in fieldnames order (no per-row dict for DictWriter)
+    with open(output_path, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(
+            [r.get("path"), r.get("line_key"), _pick_timestamp(r)] + [r.get(k) for k in ordered_others]
+            for r in all_rows
+        )
 
 
 def main() -> int:
@@ -1113,7 +1627,23 @@ def main() -> int:
     parser.add_argument("--league-query", default=None, help="Substring to match league names (e.g., NCAA)")
     parser.add_argument("--sport-name-filter", default=None, help="Optional sport name filter (e.g., Basketball, American Football)")
     parser.add_argument("--max-pages", type=int, default=2000, help="Max pages to scan when auto-finding")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached archive pages and fetch them again")
+    parser.add_argument("--raw", action="store_true", help="With the aggregate command, also save each full event to <league>_all_raw.jsonl.gz")
+    parser.add_argument("--no-bisect", action="store_true", help="Seek years with a page-by-page scan instead of galloping/binary search")
     args = parser.parse_args()
+    try:
+        from dotenv import load_dotenv  # type: ignore
+        load_dotenv()
+    except Exception:
+        pass
+    from requests import HTTPError
+    from api import PinnacleOddsClient
+    if args.refresh:
+        global _archive_cache_not_before
+        _archive_cache_not_before = time.time()
+    if args.no_bisect:
+        global _seek_bisect
+        _seek_bisect = False
     api_key = os.getenv("USER_API_KEY") or os.getenv("RAPIDAPI_KEY")
     if not api_key:
         print("Error: Provide RapidAPI key via USER_API_KEY in .env.", file=sys.stderr)
@@ -1132,6 +1662,7 @@ def main() -> int:
         sports_resp = client.list_sports()
         sports = _extract_items(sports_resp, keys=["sports", "data", "result", "response"])
         total_found = 0
+        candidates: List[Tuple[int, str]] = []
         for sp in sports:
             sid = _sport_id_from(sp)
             sname = _sport_name_from(sp)
@@ -1139,15 +1670,23 @@ def main() -> int:
                 continue
             if sport_filter and sport_filter not in _normalize(sname):
                 continue
-            leagues_resp = client.list_leagues(sport_id=sid)
+            candidates.append((sid, sname))
+        # League lists for every candidate sport are requested concurrently up front;
+        # results are consumed in sport order below
+        league_pool = ThreadPoolExecutor(max_workers=16)
+        league_futures = [league_pool.submit(client.list_leagues, sport_id=sid) for sid, _ in candidates]
+        league_pool.shutdown(wait=False)
+        for (sid, sname), leagues_future in zip(candidates, league_futures):
+            leagues_resp = leagues_future.result()
             leagues = _extract_items(leagues_resp, keys=["leagues", "data", "result", "response"])
-            for lg in leagues:
-                lid = _league_id_from(lg)
-                lname = _league_name_from(lg)
-                if lid is None or not lname:
-                    continue
-                if league_query not in _normalize(lname):
-                    continue
+            # Match every league name against the query once, before any archive paging
+            named = ((_league_id_from(lg), _league_name_from(lg)) for lg in leagues)
+            matching: List[Tuple[int, str]] = [
+                (lid, lname)
+                for lid, lname in named
+                if lid is not None and lname and league_query in _normalize(lname)
+            ]
+            for lid, lname in matching:
                 # Seek to target year for this league
                 sought = _find_page_for_year(
                     client,
@@ -1166,55 +1705,53 @@ def main() -> int:
                     continue
                 # Collect all events for that year from that starting page forward until year changes
                 out_dir = _ensure_output_dir(sname, lname)
-                year_to_events: Dict[int, Dict[int, Dict[str, Any]]] = {}
-                page_num = sought
-                while page_num <= args.max_pages:
-                    try:
-                        payload = _try_archive(
-                            client,
-                            sport_id=sid,
-                            page_num=page_num,
-                            league_id=lid,
-                            page_size=250,
-                            season=f"{target_year}-{target_year+1}",
-                            date_from=f"{target_year}-01-01",
-                            date_to=f"{target_year}-12-31",
-                        )
-                    except requests.HTTPError:
-                        break
-                    events = payload.get("events") if isinstance(payload, dict) else None
-                    if not isinstance(events, list) or len(events) == 0:
-                        break
-                    any_in_year = False
-                    for ev in events:
-                        try:
-                            lid2 = int(_get_first(ev, ["league_id", "leagueId"], 0) or 0)
-                        except Exception:
-                            continue
-                        if lid2 != lid:
-                            continue
-                        dt = _parse_iso_utc(str(_get_first(ev, ["starts", "start_time", "startTime"], "") or ""))
-                        if dt is None:
-                            continue
-                        if dt.year != target_year:
-                            continue
-                        any_in_year = True
-                        eid_val = _get_first(ev, ["event_id", "eventId"], None)
-                        try:
-                            eid = int(eid_val) if eid_val is not None else None
-                        except Exception:
-                            eid = None
-                        if not eid:
-                            continue
-                        if target_year not in year_to_events:
-                            year_to_events[target_year] = {}
-                        year_to_events[target_year][eid] = ev
-                    if args.debug:
-                        print(f"[debug] {sname}/{lname} page {page_num}: added {len(year_to_events.get(target_year, {}))} total for {target_year}")
-                    # If this page had no target-year matches, stop advancing
-                    if not any_in_year:
-                        break
-                    page_num += 1
+                year_to_events: Dict[int, Dict[int, _YearRow]] = {}
+                pages = _iter_archive_pages(
+                    client,
+                    sport_id=sid,
+                    league_id=lid,
+                    start_page=sought,
+                    max_pages=args.max_pages,
+                    page_size=250,
+                    season=f"{target_year}-{target_year+1}",
+                    date_from=f"{target_year}-01-01",
+                    date_to=f"{target_year}-12-31",
+                )
+                try:
+                    for page_num, payload in pages:
+                        events = payload.get("events") if isinstance(payload, dict) else None
+                        if not isinstance(events, list) or len(events) == 0:
+                            break
+                        any_in_year = False
+                        for ev in events:
+                            lid2 = _ev_league_id(ev)
+                            if _as_int(lid2 or 0) != lid:
+                                continue
+                            starts = _ev_starts(ev)
+                            if not isinstance(starts, str):
+                                starts = str(starts or "")
+                            dt = _parse_iso_utc(starts)
+                            if dt is None:
+                                continue
+                            if dt.year != target_year:
+                                continue
+                            any_in_year = True
+                            eid_val = _ev_event_id(ev)
+                            eid = _as_int(eid_val)
+                            if not eid:
+                                continue
+                            if target_year not in year_to_events:
+                                year_to_events[target_year] = {}
+                            year_to_events[target_year][eid] = _year_row(eid, ev, starts)
+                        if args.debug:
+                            print(f"[debug] {sname}/{lname} page {page_num}: added {len(year_to_events.get(target_year, {}))} total for {target_year}")
+                        # If this page had no target-year matches, stop advancing
+                        if not any_in_year:
+                            break
+                except HTTPError:
+                    pass
+                finally:
+                    pages.close()
                 if year_to_events.get(target_year):
                     _write_year_csv(year_to_events, out_dir, lname, target_year)
                     total_found += len(year_to_events[target_year])
@@ -1250,183 +1787,14 @@ def main() -> int:
             league_name=league_name,
             start_year=target_year,
             debug=args.debug,
+            raw=args.raw,
         )
 
         if event_id is not None:
             _header("Exporting Cleaned Tick CSV", "📦")
             print(f"Fetching historical odds for event_id={event_id} ...")
             details = client.event_details(event_id=event_id)
-
-            # Build rows from periods.history across all markets
-            def _to_epoch_and_iso(ts_val: Any) -> Tuple[int, str]:
-                ts = int(ts_val)
-                if ts > 10**12:
-                    ts = int(ts // 1000)
-                from datetime import datetime, timezone as _tz
-                iso = datetime.fromtimestamp(ts, tz=_tz.utc).isoformat()
-                return ts, iso
-
-            def _iter_event_period_ticks(event: Dict[str, Any], period_key: str, period: Dict[str, Any]):
-                sport_id = event.get("sport_id")
-                league_id = event.get("league_id")
-                league_name = event.get("league_name")
-                home = event.get("home")
-                away = event.get("away")
-                starts = event.get("starts")
-                event_id_local = event.get("event_id") or event.get("eventId")
-
-                period_number = period.get("number")
-                period_description = period.get("description")
-                hist = (period.get("history") or {})
-
-                # moneyline
-                ml = hist.get("moneyline") or {}
-                for side in ("home", "away", "draw"):
-                    seq = ml.get(side) or []
-                    for row in seq:
-                        if not isinstance(row, (list, tuple)) or len(row) < 2:
-                            continue
-                        ts, price = row[0], row[1]
-                        limit = row[2] if len(row) > 2 else None
-                        ts_epoch, ts_iso = _to_epoch_and_iso(ts)
-                        yield {
-                            "event_id": event_id_local,
-                            "sport_id": sport_id,
-                            "league_id": league_id,
-                            "league_name": league_name,
-                            "home": home,
-                            "away": away,
-                            "starts": starts,
-                            "period_number": period_number,
-                            "period_description": period_description,
-                            "market": "moneyline",
-                            "line": None,
-                            "side": side,
-                            "ts_iso": ts_iso,
-                            "ts_epoch": ts_epoch,
-                            "price": price,
-                            "limit": limit,
-                        }
-
-                # spreads
-                spreads = hist.get("spreads") or {}
-                for line, sides in spreads.items():
-                    if not isinstance(sides, dict):
-                        continue
-                    for side in ("home", "away"):
-                        seq = sides.get(side) or []
-                        for row in seq:
-                            if not isinstance(row, (list, tuple)) or len(row) < 2:
-                                continue
-                            ts, price = row[0], row[1]
-                            limit = row[2] if len(row) > 2 else None
-                            ts_epoch, ts_iso = _to_epoch_and_iso(ts)
-                            yield {
-                                "event_id": event_id_local,
-                                "sport_id": sport_id,
-                                "league_id": league_id,
-                                "league_name": league_name,
-                                "home": home,
-                                "away": away,
-                                "starts": starts,
-                                "period_number": period_number,
-                                "period_description": period_description,
-                                "market": "spread",
-                                "line": line,
-                                "side": side,
-                                "ts_iso": ts_iso,
-                                "ts_epoch": ts_epoch,
-                                "price": price,
-                                "limit": limit,
-                            }
-
-                # totals
-                totals = hist.get("totals") or {}
-                for line, sides in totals.items():
-                    if not isinstance(sides, dict):
-                        continue
-                    for side in ("over", "under"):
-                        seq = sides.get(side) or []
-                        for row in seq:
-                            if not isinstance(row, (list, tuple)) or len(row) < 2:
-                                continue
-                            ts, price = row[0], row[1]
-                            limit = row[2] if len(row) > 2 else None
-                            ts_epoch, ts_iso = _to_epoch_and_iso(ts)
-                            yield {
-                                "event_id": event_id_local,
-                                "sport_id": sport_id,
-                                "league_id": league_id,
-                                "league_name": league_name,
-                                "home": home,
-                                "away": away,
-                                "starts": starts,
-                                "period_number": period_number,
-                                "period_description": period_description,
-                                "market": "total",
-                                "line": line,
-                                "side": side,
-                                "ts_iso": ts_iso,
-                                "ts_epoch": ts_epoch,
-                                "price": price,
-                                "limit": limit,
-                            }
-
-            def _iter_all_ticks(doc: Dict[str, Any]):
-                events = doc.get("events") if isinstance(doc, dict) else None
-                if isinstance(events, list) and events:
-                    for event in events:
-                        periods = event.get("periods") or {}
-                        for pkey, period in periods.items():
-                            if not isinstance(period, dict):
-                                continue
-                            for row in _iter_event_period_ticks(event, pkey, period):
-                                yield row
-                elif isinstance(doc, dict) and any(k in doc for k in ("event_id", "eventId", "periods")):
-                    event = doc
-                    periods = event.get("periods") or {}
-                    for pkey, period in periods.items():
-                        if not isinstance(period, dict):
-                            continue
-                        for row in _iter_event_period_ticks(event, pkey, period):
-                            yield row
-
-            rows = list(_iter_all_ticks(details))
-            rows.sort(key=lambda r: (
-                r.get("event_id"),
-                r.get("period_number"),
-                r.get("ts_epoch"),
-                str(r.get("market")),
-                str(r.get("line")),
-                str(r.get("side")),
-            ))
-
-            # Derive filename: team1_team2_YYYY-MM-DD.csv
-            single_event = None
-            evs = details.get("events") if isinstance(details, dict) else None
-            if isinstance(evs, list) and evs:
-                single_event = evs[0]
-            elif isinstance(details, dict):
-                single_event = details
-            home = (single_event or {}).get("home") or "home"
-            away = (single_event or {}).get("away") or "away"
-            starts = (single_event or {}).get("starts") or ""
-            dt = _parse_iso_utc(str(starts) or "")
-            date_str = dt.date().isoformat() if dt else str(starts)[:10]
-            fname = f"{date_str}_{_name_compact(home)}_{_name_compact(away)}.csv"
-
-            with open(fname, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(
-                    f,
-                    fieldnames=[
-                        "event_id", "sport_id", "league_id", "league_name", "home", "away", "starts",
-                        "period_number", "period_description",
-                        "market", "line", "side", "ts_iso", "ts_epoch", "price", "limit",
-                    ],
-                )
-                writer.writeheader()
-                for r in rows:
-                    writer.writerow(r)
+            fname = _export_event_csv_from_details(details)
             print(f"🎉 Done: {fname}")
     except Exception as exc:
         print(f"Error: {exc}", file=sys.stderr)
@@ -11,14 +11,21 @@ TLDR: Fetches NFL market data from Pinnacle API and returns it as a Pandas DataF
     - Team-specific totals (home/away)
     - Event metadata (start time, league, teams, event type)
 - Handles nested data structures where events might be under "leagues" or "events".
+- Skips events whose markets are closed (open_flags.is_open is False).
 - Returns a DataFrame with one row per event period.
+- fetch_pinnacle_nfl_array() returns the numeric odds columns as a NumPy structured array.
 """
 #Imports
-import csv
 import os
 import sys
-sys.path.append(os.path.abspath("odds-collector-script-main"))
+import time
+from operator import itemgetter
+# odds-collector-script-main sits next to this file; add it to the import path once
+_COLLECTOR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "odds-collector-script-main")
+if _COLLECTOR_DIR not in sys.path:
+    sys.path.append(_COLLECTOR_DIR)
 from api import PinnacleOddsClient
+import numpy as np
 import pandas as pd
 
 # API key for Pinnacle API (set as environment variable)
@@ -28,121 +35,187 @@ API_KEY = os.getenv("USER_API_KEY")
 SPORT_ID = 7
 LEAGUE_ID = 889
 
-# Output CSV file (if needed)
+# Output CSV file for save_pinnacle_nfl_csv()
 OUTPUT_FILE = "pinnacle_nfl_markets.csv"
 
-def fetch_pinnacle_nfl_df():
-    client = PinnacleOddsClient(api_key=API_KEY)
+# Output columns, in DataFrame order
+_COLUMNS = (
+    "event_id", "sport_id", "league_id", "league_name", "home", "away", "starts", "event_type", "period",
+    "moneyline_home", "moneyline_draw", "moneyline_away",
+    "spread_handicap", "spread_home", "spread_away",
+    "total_points", "total_over", "total_under",
+    "home_team_over", "home_team_under", "away_team_over", "away_team_under",
+    "is_open",
+)
+
+# Decimal-odds / line columns (moneyline through team totals)
+_PRICE_COLUMNS = _COLUMNS[9:22]
+
+# Explicit DataFrame dtypes: nullable ids, float prices, categorical labels
+_DTYPES = {
+    "event_id": "Int64", "sport_id": "Int64", "league_id": "Int64",
+    "league_name": "category", "event_type": "category", "period": "category",
+    "is_open": "bool",
+    **dict.fromkeys(_PRICE_COLUMNS, "float64"),
+}
+
+# Numeric columns exposed by fetch_pinnacle_nfl_array()
+_ARRAY_DTYPE = np.dtype([("event_id", "i8")] + [(name, "f8") for name in _PRICE_COLUMNS])
+
+# Event metadata copied onto every row
+_EVENT_FIELDS = ("event_id", "sport_id", "league_id", "league_name", "home", "away", "starts", "event_type")
+_event_fields = itemgetter(*_EVENT_FIELDS)
+
+# Shared read-only fallback for missing nested objects (never mutated)
+_EMPTY = {}
+
+# One client (and its pooled requests.Session) reused across calls so connections stay warm
+_CLIENT = None
+
+def _get_client():
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = PinnacleOddsClient(api_key=API_KEY)
+    return _CLIENT
+
+# Markets responses are reused for this many seconds, so back-to-back scans share one request
+MARKETS_TTL_SECONDS = 10
+_markets_cache = {}  # event_type -> (monotonic fetch time, payload)
+
+def _list_markets_cached(client, event_type):
+    now = time.monotonic()
+    cached = _markets_cache.get(event_type)
+    if cached is not None and now - cached[0] < MARKETS_TTL_SECONDS:
+        return cached[1]
+    payload = client.list_markets(sport_id=SPORT_ID, event_type=event_type, is_have_odds=True)
+    _markets_cache[event_type] = (now, payload)
+    return payload
+
+def _fetch_nfl_columns():
+    """
+    Fetches NFL Game-period markets and returns one list per _COLUMNS entry
+    """
+    client = _get_client()
 
-    # Fetch all live/prematch markets
-    events_data = client.list_markets(sport_id=SPORT_ID, event_type="prematch", is_have_odds=True)
+    # Fetch all live/prematch markets (served from the short-lived cache when fresh)
+    events_data = _list_markets_cached(client, "prematch")
 
-    # Determine correct event list (sometimes nested under leagues)
+    # Determine correct event list (sometimes nested under leagues) and keep only the target league
     if "events" in events_data:
-        all_events = events_data["events"]
+        league_events = [e for e in events_data["events"] if e.get("league_id") == LEAGUE_ID]
     elif "leagues" in events_data:
-        all_events = []
+        # Nested form: pick the target league directly instead of flattening every league;
+        # leagues without an id of their own fall back to filtering their events
+        league_events = []
         for league in events_data["leagues"]:
-            all_events.extend(league.get("events", []))
+            lg_id = league.get("league_id", league.get("id"))
+            if lg_id is None:
+                league_events.extend(e for e in league.get("events", ()) if e.get("league_id") == LEAGUE_ID)
+            elif lg_id == LEAGUE_ID:
+                league_events.extend(league.get("events", ()))
     else:
-        all_events = []
+        league_events = []
 
-    # Filter events by target league
-    league_events = [e for e in all_events if e.get("league_id") == LEAGUE_ID]
-
-    rows = []
+    # One list per output column, in _COLUMNS order
+    columns = tuple([] for _ in _COLUMNS)
+    (event_ids, sport_ids, league_ids, league_names, homes, aways, starts, event_types, period_names,
+     ml_home, ml_draw, ml_away, spread_hdp, spread_home, spread_away,
+     total_points, total_over, total_under,
+     home_tt_over, home_tt_under, away_tt_over, away_tt_under, is_open) = columns
 
     for event in league_events:
-        # Extract general event metadata
-        event_id = event.get("event_id")
-        sport_id = event.get("sport_id")
-        league_id = event.get("league_id")
-        league_name = event.get("league_name")
-        home = event.get("home")
-        away = event.get("away")
-        start = event.get("starts")
-        event_type = event.get("event_type")
-        open_flags = event.get("open_flags") or {}
-
-        # Iterate through periods (e.g., Game, Quarter, Half)
-        periods = event.get("periods") or {}
-        for period_key, period in periods.items():
-            period_name = period.get("description")
-            if period_name != "Game":
-                continue
-
-            # Flatten moneyline, spreads, totals, team totals
-            row = {
-                "event_id": event_id,
-                "sport_id": sport_id,
-                "league_id": league_id,
-                "league_name": league_name,
-                "home": home,
-                "away": away,
-                "starts": start,
-                "event_type": event_type,
-                "period": period_name,
-                "moneyline_home": None,
-                "moneyline_draw": None,
-                "moneyline_away": None,
-                "spread_handicap": None,
-                "spread_home": None,
-                "spread_away": None,
-                "total_points": None,
-                "total_over": None,
-                "total_under": None,
-                "home_team_over": None,
-                "home_team_under": None,
-                "away_team_over": None,
-                "away_team_under": None,
-                "is_open": open_flags.get("is_open", True)
-            }
-
-            # Moneyline
-            ml = period.get("money_line") or {}
-            row["moneyline_home"] = ml.get("home")
-            row["moneyline_draw"] = ml.get("draw")
-            row["moneyline_away"] = ml.get("away")
-
-            # Spread (just take the main if available)
-            spreads = period.get("spreads") or {}
-            if spreads:
-                main_spread = list(spreads.values())[0]
-                row["spread_handicap"] = main_spread.get("hdp")
-                row["spread_home"] = main_spread.get("home")
-                row["spread_away"] = main_spread.get("away")
-
-            # Totals (main)
-            totals = period.get("totals") or {}
-            if totals:
-                main_total = list(totals.values())[0]
-                row["total_points"] = main_total.get("points")
-                row["total_over"] = main_total.get("over")
-                row["total_under"] = main_total.get("under")
-
-            # Team totals
-            team_total = period.get("team_total") or {}
-            home_tt = team_total.get("home") or {}
-            away_tt = team_total.get("away") or {}
-            row["home_team_over"] = home_tt.get("over")
-            row["home_team_under"] = home_tt.get("under")
-            row["away_team_over"] = away_tt.get("over")
-            row["away_team_under"] = away_tt.get("under")
-
-            # Append row to results
-            rows.append(row)
-
-    return pd.DataFrame(rows) # Convert list of dictionaries to DataFrame
-
-# Commented out section if needed to save csv verions of the data
+        open_flags = event.get("open_flags") or _EMPTY
+        # Closed markets carry no usable prices; drop them before assembling a row
+        if not open_flags.get("is_open", True):
+            continue
+
+        # Full-game markets live under num_0; other periods (halves, quarters) are skipped
+        periods = event.get("periods") or _EMPTY
+        period = periods.get("num_0")
+        if period is None:
+            continue
+        period_name = period.get("description")
+        if period_name != "Game":
+            continue
+
+        # Extract general event metadata in one call; fall back to .get when a field is missing
+        try:
+            event_id, sport_id, league_id, league_name, home, away, start, event_type = _event_fields(event)
+        except KeyError:
+            event_id, sport_id, league_id, league_name, home, away, start, event_type = map(event.get, _EVENT_FIELDS)
+
+        event_ids.append(event_id)
+        sport_ids.append(sport_id)
+        league_ids.append(league_id)
+        league_names.append(league_name)
+        homes.append(home)
+        aways.append(away)
+        starts.append(start)
+        event_types.append(event_type)
+        period_names.append(period_name)
+        is_open.append(True)  # closed events were skipped above; kept for schema compatibility
+
+        # Moneyline
+        ml = period.get("money_line") or _EMPTY
+        ml_home.append(ml.get("home"))
+        ml_draw.append(ml.get("draw"))
+        ml_away.append(ml.get("away"))
+
+        # Spread (just take the main if available)
+        spreads = period.get("spreads") or _EMPTY
+        if spreads:
+            main_spread = next(iter(spreads.values()))
+            spread_hdp.append(main_spread.get("hdp"))
+            spread_home.append(main_spread.get("home"))
+            spread_away.append(main_spread.get("away"))
+        else:
+            spread_hdp.append(None)
+            spread_home.append(None)
+            spread_away.append(None)
+
+        # Totals (main)
+        totals = period.get("totals") or _EMPTY
+        if totals:
+            main_total = next(iter(totals.values()))
+            total_points.append(main_total.get("points"))
+            total_over.append(main_total.get("over"))
+            total_under.append(main_total.get("under"))
+        else:
+            total_points.append(None)
+            total_over.append(None)
+            total_under.append(None)
+
+        # Team totals
+        team_total = period.get("team_total") or _EMPTY
+        home_tt = team_total.get("home") or _EMPTY
+        away_tt = team_total.get("away") or _EMPTY
+        home_tt_over.append(home_tt.get("over"))
+        home_tt_under.append(home_tt.get("under"))
+        away_tt_over.append(away_tt.get("over"))
+        away_tt_under.append(away_tt.get("under"))
+
+    return columns
+
+def fetch_pinnacle_nfl_df():
+    # Build the DataFrame column-wise in one go, then pin the dtypes
+    df = pd.DataFrame(dict(zip(_COLUMNS, _fetch_nfl_columns())))
+    return df.astype(_DTYPES)
+
+def fetch_pinnacle_nfl_array():
+    """
+    Returns event_id plus the numeric odds columns as a NumPy structured array
+    (missing prices are NaN, a missing event_id is -1)
+    """
+    columns = _fetch_nfl_columns()
+    out = np.empty(len(columns[0]), dtype=_ARRAY_DTYPE)
+    out["event_id"] = [-1 if eid is None else eid for eid in columns[0]]
+    for name in _ARRAY_DTYPE.names[1:]:
+        out[name] = np.array(columns[_COLUMNS.index(name)], dtype="f8")
+    return out
+
+def save_pinnacle_nfl_csv(df, path=OUTPUT_FILE):
     """
-    # Write CSV
-    if rows:
-        fieldnames = list(rows[0].keys())
-        with open(OUTPUT_FILE, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(rows)
-
-    print(f"Saved {len(rows)} market lines to {OUTPUT_FILE}")
+    Saves the DataFrame from fetch_pinnacle_nfl_df() to a CSV file
     """
+    df.to_csv(path, index=False)
+    print(f"Saved {len(df)} market lines to {path}")